@@ -0,0 +1,169 @@
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bst import (  # noqa: E402
+    ArrayBinarySearchTree,
+    BinarySearchTree,
+    ConcurrentBinarySearchTree,
+)
+
+
+class DictNode:
+    # Node layout before __slots__, for the memory baseline
+    def __init__(self, data):
+        self.data = data
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.height = 1
+        self.size = 1
+        self.color = "red"
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def build(balance, keys):
+    tree = BinarySearchTree(balance=balance)
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def probe(tree, keys):
+    for key in keys:
+        tree.search(key)
+
+
+def bench_sorted_insert(n, plain_n):
+    # The plain tree degenerates into a linked list on sorted input (O(n^2)
+    # total), so it is measured on a smaller prefix and extrapolated
+    print(f"Sorted insert of {n:,} keys (plain tree measured at {plain_n:,})")
+    for balance in (None, "avl", "rb"):
+        size = plain_n if balance is None else n
+        keys = range(size)
+        build_time, tree = timed(build, balance, keys)
+        probes = random.sample(keys, min(size, 100_000))
+        search_time, _ = timed(probe, tree, probes)
+        estimate = build_time * (n / size) ** 2 if balance is None else build_time
+        print(
+            f"  {str(balance):>4}: build {build_time:8.3f}s"
+            f" (~{estimate:,.1f}s at {n:,})"
+            f" | {len(probes):,} searches {search_time:7.3f}s"
+            f" | height {tree.height(tree.root):,}"
+        )
+
+
+def bench_bulk_load(n):
+    print(f"Bulk load of {n:,} sorted keys")
+    insert_time, _ = timed(build, "rb", range(n))
+    load_time, tree = timed(BinarySearchTree.from_sorted, range(n), "rb")
+    print(f"  rb insert loop {insert_time:8.3f}s | from_sorted {load_time:8.3f}s")
+    other = BinarySearchTree.from_sorted(range(n // 2, n + n // 2), "rb")
+    for name in ("union", "intersection", "difference"):
+        op_time, _ = timed(getattr(tree, name), other)
+        print(f"  {name:>12} of two {n:,}-key trees {op_time:8.3f}s")
+
+
+def bytes_per_key(fn, keys):
+    tracemalloc.start()
+    result = fn(keys)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return used / len(keys)
+
+
+def bench_memory(n):
+    print(f"Memory per key for {n:,} keys (key objects excluded)")
+    keys = list(range(n))
+    layouts = (
+        ("Node with __dict__", lambda ks: [DictNode(k) for k in ks]),
+        ("Node with __slots__", lambda ks: BinarySearchTree.from_sorted(ks)),
+        ("ArrayBinarySearchTree", lambda ks: ArrayBinarySearchTree.from_sorted(ks)),
+    )
+    for name, fn in layouts:
+        print(f"  {name:>22}: {bytes_per_key(fn, keys):6.1f} bytes/key")
+
+
+class LockedBinarySearchTree:
+    # Baseline: a red-black tree behind one mutex
+    def __init__(self, keys):
+        self.tree = BinarySearchTree.from_sorted(keys, balance="rb")
+        self.lock = threading.Lock()
+
+    def search(self, data):
+        with self.lock:
+            return self.tree.search(data)
+
+    def insert(self, data):
+        with self.lock:
+            self.tree.insert(data)
+
+
+def run_workers(tree, threads, ops, write_ratio, key_space):
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(ops):
+            key = rng.randrange(key_space)
+            if rng.random() < write_ratio:
+                tree.insert(key)
+            else:
+                tree.search(key)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def bench_concurrency(n, threads=8, ops=20_000):
+    print(f"{threads} threads x {ops:,} ops on {n:,} keys (ops/s)")
+    keys = range(0, 2 * n, 2)
+    for write_ratio in (0.0, 0.05, 0.2, 0.5):
+        locked = run_workers(
+            LockedBinarySearchTree(keys), threads, ops, write_ratio, 2 * n
+        )
+        tree = ConcurrentBinarySearchTree.from_sorted(keys)
+        versioned = run_workers(tree, threads, ops, write_ratio, 2 * n)
+        print(
+            f"  writes {write_ratio:4.0%}: single lock {locked:10,.0f}"
+            f" | ConcurrentBinarySearchTree {versioned:10,.0f}"
+        )
+
+
+def bench_freeze(n, probe_count=10**6):
+    import numpy as np
+
+    print(f"{probe_count:,} probes against {n:,} keys")
+    tree = BinarySearchTree.from_sorted(range(0, 2 * n, 2), balance="rb")
+    probes = [random.randrange(2 * n) for _ in range(probe_count)]
+    walk_time, _ = timed(probe, tree, probes)
+    freeze_time, index = timed(tree.freeze)
+    batch_time, _ = timed(index.search_many, np.array(probes, dtype=index.keys.dtype))
+    print(
+        f"  tree.search loop {walk_time:8.3f}s | freeze {freeze_time:8.3f}s"
+        f" | search_many {batch_time:8.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    plain_n = min(n, 5_000)
+    bench_sorted_insert(n, plain_n)
+    bench_bulk_load(n)
+    bench_memory(n)
+    bench_concurrency(n)
+    bench_freeze(n)
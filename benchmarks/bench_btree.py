@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bst import BinarySearchTree  # noqa: E402
+from btree import BTree  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def build(tree, keys):
+    for key in keys:
+        tree.insert(key)
+    return tree
+
+
+def probe(tree, keys):
+    for key in keys:
+        tree.search(key)
+
+
+def scan(tree, lo, hi):
+    count = 0
+    for _ in tree.iter_range(lo, hi):
+        count += 1
+    return count
+
+
+def bench_fanout(n, probes):
+    print(
+        f"{n:,} random keys, {len(probes):,} searches, range scan of {n // 10:,} keys"
+    )
+    keys = random.sample(range(10 * n), n)
+    lo, hi = sorted(keys)[n // 2], sorted(keys)[n // 2 + n // 10]
+    trees = [("rb BinarySearchTree", BinarySearchTree(balance="rb"))]
+    trees += [
+        (f"BTree order={order}", BTree(order)) for order in (4, 8, 16, 32, 64, 128, 256)
+    ]
+    for name, tree in trees:
+        build_time, _ = timed(build, tree, keys)
+        search_time, _ = timed(probe, tree, probes)
+        scan_time, _ = timed(scan, tree, lo, hi)
+        height = (
+            tree.height(tree.root)
+            if isinstance(tree, BinarySearchTree)
+            else tree.height()
+        )
+        print(
+            f"  {name:>20}: build {build_time:7.3f}s | search {search_time:7.3f}s"
+            f" | scan {scan_time:7.3f}s | height {height}"
+        )
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    bench_fanout(n, [random.randrange(10 * n) for _ in range(min(n, 200_000))])
@@ -0,0 +1,299 @@
+import asyncio
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from heap import (  # noqa: E402
+    AsyncPriorityQueue,
+    BlockingPriorityQueue,
+    DaryHeap,
+    IndexedMinHeap,
+    LeftistHeap,
+    MinHeap,
+    PairingHeap,
+    TopK,
+)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def reprioritize_scan(heap, updates):
+    # Baseline: find the job by scanning the array, then delete and re-insert
+    for job, priority in updates:
+        heap.delete(next(i for i, entry in enumerate(heap.heap) if entry[1] == job))
+        heap.insert((priority, job))
+
+
+def reprioritize_indexed(heap, updates):
+    for job, priority in updates:
+        if priority < heap.priority[job]:
+            heap.decrease_key(job, priority)
+        else:
+            heap.increase_key(job, priority)
+
+
+def bench_reprioritize(n, m):
+    print(f"{n:,} jobs, {m:,} priority updates")
+    rng = random.Random(0)
+    priorities = [rng.random() for _ in range(n)]
+    updates = [(rng.randrange(n), rng.random()) for _ in range(m)]
+    scan_heap = MinHeap()
+    indexed_heap = IndexedMinHeap()
+    for job, priority in enumerate(priorities):
+        scan_heap.insert((priority, job))
+        indexed_heap.insert(job, priority)
+    scan_time, _ = timed(reprioritize_scan, scan_heap, updates[: max(1, m // 100)])
+    indexed_time, _ = timed(reprioritize_indexed, indexed_heap, updates)
+    print(f"  MinHeap scan + delete: {scan_time * 100:8.3f}s (extrapolated from 1%)")
+    print(f"  IndexedMinHeap:        {indexed_time:8.3f}s")
+
+
+def meld_shards(heap_class, shards):
+    # Fold every shard into one accumulator, as a shard-merging worker does
+    result = heap_class()
+    for shard in shards:
+        heap = heap_class()
+        for data in shard:
+            heap.insert(data)
+        result.meld(heap)
+    return result
+
+
+def drain(heap):
+    while not heap.is_empty():
+        heap.extract_min()
+
+
+def bench_meld(n, shard_size):
+    print(
+        f"Melding {n // shard_size:,} shards of {shard_size:,} keys,"
+        f" then extracting all {n:,}"
+    )
+    rng = random.Random(0)
+    shards = [[rng.random() for _ in range(shard_size)] for _ in range(n // shard_size)]
+    for heap_class in (MinHeap, PairingHeap, LeftistHeap):
+        meld_time, heap = timed(meld_shards, heap_class, shards)
+        extract_time, _ = timed(drain, heap)
+        print(
+            f"  {heap_class.__name__:>12}: meld {meld_time:8.3f}s"
+            f" | extract {extract_time:8.3f}s"
+        )
+
+
+def insert_all(items):
+    heap = MinHeap()
+    for data in items:
+        heap.insert(data)
+    return heap
+
+
+def ticks_single(heap, batches):
+    for batch in batches:
+        for data in batch:
+            heap.insert(data)
+        for _ in range(len(batch)):
+            heap.extract_min()
+
+
+def ticks_batched(heap, batches):
+    for batch in batches:
+        heap.push_many(batch)
+        heap.pop_many(len(batch))
+
+
+def bench_batch(n, batch_size):
+    print(
+        f"Building from {n:,} keys, then {n // batch_size:,} ticks"
+        f" of {batch_size:,} pushes and pops"
+    )
+    rng = random.Random(0)
+    items = [rng.random() for _ in range(n)]
+    batches = [
+        [rng.random() for _ in range(batch_size)] for _ in range(n // batch_size)
+    ]
+    insert_time, heap = timed(insert_all, items)
+    bulk_time, bulk_heap = timed(MinHeap.from_iterable, items)
+    print(f"  insert loop {insert_time:8.3f}s | from_iterable {bulk_time:8.3f}s")
+    single_time, _ = timed(ticks_single, heap, batches)
+    batched_time, _ = timed(ticks_batched, bulk_heap, batches)
+    print(
+        f"  insert/extract_min {single_time:8.3f}s"
+        f" | push_many/pop_many {batched_time:8.3f}s"
+    )
+
+
+def churn_tuples(heap, priorities):
+    for payload, priority in enumerate(priorities):
+        heap.insert((priority, payload))
+    while not heap.is_empty():
+        heap.extract_min()
+
+
+def churn_dary(heap, priorities):
+    for payload, priority in enumerate(priorities):
+        heap.insert(payload, priority)
+    while not heap.is_empty():
+        heap.extract_min()
+
+
+def retained(fn, *args):
+    # Bytes still allocated by fn's result once it returns
+    tracemalloc.start()
+    result = fn(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_dary(ops):
+    n = ops // 2
+    print(
+        f"{ops:,} operations: {n:,} inserts of float priorities, then {n:,} extract_min"
+    )
+    priorities = np.random.default_rng(0).random(n)
+    values = priorities.tolist()
+    churn_time, _ = timed(churn_tuples, MinHeap(), values)
+    build_time, _ = timed(MinHeap.from_iterable, zip(values, range(n)))
+    memory = retained(MinHeap.from_iterable, zip(values, range(n))) / n
+    print(
+        f"  {'MinHeap':>12}: churn {churn_time:8.3f}s | bulk build {build_time:8.3f}s"
+        f" | {memory:5.1f} bytes/entry"
+    )
+    for d in (2, 4, 8):
+        churn_time, _ = timed(churn_dary, DaryHeap(d), values)
+        build_time, _ = timed(DaryHeap.from_arrays, priorities, None, d)
+        memory = retained(DaryHeap.from_arrays, priorities, None, d) / n
+        print(
+            f"  {f'DaryHeap d={d}':>12}: churn {churn_time:8.3f}s"
+            f" | bulk build {build_time:8.3f}s"
+            f" | {memory:5.1f} bytes/entry"
+        )
+
+
+def top_k_full_heap(scores, k):
+    # Baseline: keep every event, then pop the best k
+    heap = MinHeap.from_iterable(-score for score in scores)
+    return [-heap.extract_min() for _ in range(k)]
+
+
+def top_k_collector(scores, k):
+    collector = TopK(k)
+    collector.add_many(scores)
+    return collector.result()
+
+
+def peak(fn, *args):
+    tracemalloc.start()
+    fn(*args)
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+
+def bench_top_k(n, k):
+    print(f"Top {k} of a stream of {n:,} scores")
+    rng = random.Random(0)
+    scores = [rng.random() for _ in range(n)]
+    for name, fn in (("MinHeap of all", top_k_full_heap), ("TopK", top_k_collector)):
+        elapsed, _ = timed(fn, iter(scores), k)
+        memory = peak(fn, iter(scores), k)
+        print(f"  {name:>14}: {elapsed:8.3f}s | peak {memory / 2**20:8.2f} MiB")
+
+
+STOP = (float("inf"), -1)  # Sorts after every job; one per consumer
+
+
+def mpmc_threads(q, producers, consumers, n, batch):
+    def produce(seed):
+        rng = random.Random(seed)
+        for i in range(n // producers):
+            q.put((rng.random(), i))
+
+    def drain_queue():
+        while True:
+            jobs = q.get_many(batch) if batch > 1 else [q.get()]
+            # A consumer that takes several stop markers hands the rest back
+            taken = sum(job is STOP for job in jobs)
+            for _ in range(taken - 1):
+                q.put(STOP)
+            if taken:
+                return
+
+    workers = [threading.Thread(target=drain_queue) for _ in range(consumers)]
+    feeders = [
+        threading.Thread(target=produce, args=(seed,)) for seed in range(producers)
+    ]
+    for thread in workers + feeders:
+        thread.start()
+    for thread in feeders:
+        thread.join()
+    for _ in range(consumers):
+        q.put(STOP)
+    for thread in workers:
+        thread.join()
+
+
+async def mpmc_async(q, producers, consumers, n, batch):
+    async def produce(seed):
+        rng = random.Random(seed)
+        for i in range(n // producers):
+            await q.put((rng.random(), i))
+
+    async def drain_queue():
+        while True:
+            jobs = await q.get_many(batch) if batch > 1 else [await q.get()]
+            taken = sum(job is STOP for job in jobs)
+            for _ in range(taken - 1):
+                await q.put(STOP)
+            if taken:
+                return
+
+    workers = [asyncio.create_task(drain_queue()) for _ in range(consumers)]
+    await asyncio.gather(*(produce(seed) for seed in range(producers)))
+    for _ in range(consumers):
+        await q.put(STOP)
+    await asyncio.gather(*workers)
+
+
+def bench_queues(n, producers, consumers, maxsize):
+    print(
+        f"{n:,} jobs, {producers} producers, {consumers} consumers, maxsize {maxsize:,}"
+    )
+    runs = [
+        ("queue.PriorityQueue", queue.PriorityQueue, 1),
+        ("BlockingPriorityQueue", BlockingPriorityQueue, 1),
+        ("BlockingPriorityQueue get_many(64)", BlockingPriorityQueue, 64),
+        ("asyncio.PriorityQueue", asyncio.PriorityQueue, 1),
+        ("AsyncPriorityQueue", AsyncPriorityQueue, 1),
+        ("AsyncPriorityQueue get_many(64)", AsyncPriorityQueue, 64),
+    ]
+    for name, queue_class, batch in runs:
+        args = (queue_class(maxsize), producers, consumers, n, batch)
+        if queue_class in (asyncio.PriorityQueue, AsyncPriorityQueue):
+            elapsed, _ = timed(asyncio.run, mpmc_async(*args))
+        else:
+            elapsed, _ = timed(mpmc_threads, *args)
+        print(f"  {name:>34}: {elapsed:8.3f}s | {n / elapsed:12,.0f} jobs/s")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    bench_reprioritize(n, n)
+    bench_meld(n, max(1, n // 100))
+    bench_batch(n, 1000)
+    bench_dary(10 * n)
+    bench_top_k(10 * n, 100)
+    bench_queues(n, 4, 4, 1024)
@@ -0,0 +1,103 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from heap import MinHeap  # noqa: E402
+from timing_wheel import TimingWheel  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+class LazyHeapScheduler:
+    # Baseline: MinHeap of (deadline, sequence, handle); cancel only flags the
+    # handle and advance skips flagged entries as they surface
+    def __init__(self):
+        self.heap = MinHeap()
+        self.sequence = 0
+
+    def schedule(self, deadline, item):
+        self.sequence += 1
+        handle = [item, True]
+        self.heap.insert((deadline, self.sequence, handle))
+        return handle
+
+    def cancel(self, handle):
+        handle[1] = False
+
+    def advance(self, now):
+        expired = []
+        while not self.heap.is_empty() and self.heap.peek()[0] <= now:
+            item, alive = self.heap.extract_min()[2]
+            if alive:
+                expired.append(item)
+        return expired
+
+
+class EagerHeapScheduler(LazyHeapScheduler):
+    # Baseline: cancel finds the entry with a linear scan and deletes it
+    def cancel(self, handle):
+        for index, entry in enumerate(self.heap.heap):
+            if entry[2] is handle:
+                self.heap.delete(index)
+                return
+
+
+def schedule_all(scheduler, deadlines):
+    return [scheduler.schedule(deadline, i) for i, deadline in enumerate(deadlines)]
+
+
+def cancel_all(scheduler, handles):
+    for handle in handles:
+        scheduler.cancel(handle)
+
+
+def run_clock(scheduler, horizon, step):
+    fired = 0
+    for now in range(step, horizon + step, step):
+        fired += len(scheduler.advance(now))
+    return fired
+
+
+def bench_cancel_heavy(n, horizon, step):
+    print(
+        f"{n:,} timers over {horizon:,} ticks, 90% cancelled,"
+        f" advancing every {step} ticks"
+    )
+    rng = random.Random(0)
+    deadlines = [rng.uniform(0, horizon) for _ in range(n)]
+    doomed = rng.sample(range(n), 9 * n // 10)
+    schedulers = [
+        ("MinHeap, lazy cancel", LazyHeapScheduler()),
+        ("TimingWheel", TimingWheel()),
+        ("TimingWheel, 2 levels + heap", TimingWheel(levels=2)),
+    ]
+    for name, scheduler in schedulers:
+        schedule_time, handles = timed(schedule_all, scheduler, deadlines)
+        cancel_time, _ = timed(cancel_all, scheduler, [handles[i] for i in doomed])
+        advance_time, fired = timed(run_clock, scheduler, horizon, step)
+        print(
+            f"  {name:>28}: schedule {schedule_time:7.3f}s | cancel {cancel_time:7.3f}s"
+            f" | advance {advance_time:7.3f}s | fired {fired:,}"
+        )
+    # Cancelling by scan is O(n) per call, so time a sample and extrapolate
+    scheduler = EagerHeapScheduler()
+    handles = schedule_all(scheduler, deadlines)
+    sample = doomed[: max(1, len(doomed) // 1000)]
+    cancel_time, _ = timed(cancel_all, scheduler, [handles[i] for i in sample])
+    estimate = cancel_time * len(doomed) / len(sample)
+    print(
+        f"  {'MinHeap, scan + delete':>28}: cancel {estimate:9.1f}s"
+        " (extrapolated from 0.1%)"
+    )
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    bench_cancel_heavy(n, 100_000, 10)
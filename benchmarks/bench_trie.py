@@ -0,0 +1,208 @@
+import heapq
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trie import AhoCorasick, FrozenTrie, RadixTrie, Trie  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def random_words(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12)))
+        for _ in range(n)
+    ]
+
+
+def build_trie(words):
+    trie = Trie()
+    for word in words:
+        trie.insert(word)
+    return trie
+
+
+def subtree_top_k(trie, prefix, k):
+    # Baseline: walk the whole subtree under prefix and rank every word
+    node = trie.root
+    for char in prefix:
+        node = node.children.get(char) if node.children else None
+        if node is None:
+            return []
+    ranked = []
+    stack = [(node, prefix)]
+    while stack:
+        node, word = stack.pop()
+        if node.is_end:
+            ranked.append((-node.weight, word))
+        for char, child_node in (node.children or {}).items():
+            stack.append((child_node, word + char))
+    return [word for _, word in heapq.nsmallest(k, ranked)]
+
+
+def bench_complete(n, queries=1_000):
+    print(
+        f"Top-10 completions over {n:,} weighted words, {queries:,} queries per prefix"
+    )
+    words = random_words(n)
+    trie = Trie(cache_size=10)
+    build_time, _ = timed(
+        lambda: [trie.insert(w, random.randint(1, 10**6)) for w in words]
+    )
+    print(f"  build {build_time:.3f}s")
+    for prefix in ("a", "ab", "abc"):
+        cached, _ = timed(lambda: [trie.complete(prefix, 10) for _ in range(queries)])
+        walked, _ = timed(lambda: [subtree_top_k(trie, prefix, 10) for _ in range(3)])
+        walked *= queries / 3
+        print(
+            f"  prefix {prefix!r:>5}: cached {cached:8.4f}s"
+            f" | subtree walk ~{walked:8.3f}s"
+        )
+
+
+def random_paths(n, seed=0):
+    rng = random.Random(seed)
+    dirs = ["".join(rng.choices(string.ascii_lowercase, k=8)) for _ in range(50)]
+    return [
+        f"/srv/{rng.choice(dirs)}/{rng.choice(dirs)}/{rng.getrandbits(64):016x}.log"
+        for _ in range(n)
+    ]
+
+
+def bench_radix(n):
+    print(f"Memory and search latency for {n:,} file paths")
+    paths = random_paths(n)
+    for cls in (Trie, RadixTrie):
+        tracemalloc.start()
+        trie = cls()
+        for path in paths:
+            trie.insert(path)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        search_time, _ = timed(lambda: [trie.search(path) for path in paths])
+        print(
+            f"  {cls.__name__:>9}: {used / n:8.1f} bytes/path"
+            f" | search {search_time / n * 1e6:6.2f} us/path"
+        )
+
+
+def bench_frozen(n):
+    print(f"Startup for {n:,} words: rebuild vs memory-mapped frozen trie")
+    words = random_words(n)
+    build_time, trie = timed(build_trie, words)
+    path = os.path.join(tempfile.mkdtemp(), "words.trie")
+    freeze_time, _ = timed(trie.freeze, path)
+    open_time, frozen = timed(FrozenTrie.open, path)
+    probes = words[: min(n, 100_000)]
+    live_time, _ = timed(lambda: [trie.search(w) for w in probes])
+    mapped_time, _ = timed(lambda: [frozen.search(w) for w in probes])
+    print(
+        f"  rebuild {build_time:8.3f}s | freeze {freeze_time:8.3f}s"
+        f" ({os.path.getsize(path) / n:.1f} bytes/word) | open {open_time * 1e3:8.3f}ms"
+    )
+    print(
+        f"  {len(probes):,} searches: in-memory {live_time:7.3f}s"
+        f" | mapped {mapped_time:7.3f}s"
+    )
+    frozen.close()
+
+
+def levenshtein(a, b):
+    prev = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        row = [i]
+        for j, char_b in enumerate(b, 1):
+            row.append(
+                min(row[j - 1] + 1, prev[j] + 1, prev[j - 1] + (char_a != char_b))
+            )
+        prev = row
+    return prev[-1]
+
+
+def bench_fuzzy(n, queries=20):
+    print(f"Fuzzy search over {n:,} words, {queries} queries per distance")
+    words = random_words(n)
+    trie = build_trie(words)
+    rng = random.Random(1)
+    probes = [
+        w[:-1] + rng.choice(string.ascii_lowercase) for w in rng.sample(words, queries)
+    ]
+    for max_distance in (1, 2):
+        walk_time, _ = timed(
+            lambda: [trie.fuzzy_search(p, max_distance) for p in probes]
+        )
+        scan_probes = probes[:2]
+        scan_time, _ = timed(
+            lambda: [
+                [w for w in words if levenshtein(p, w) <= max_distance]
+                for p in scan_probes
+            ]
+        )
+        scan_time *= len(probes) / len(scan_probes)
+        print(
+            f"  distance <= {max_distance}:"
+            f" trie walk {walk_time / len(probes) * 1e3:9.2f}ms/query"
+            f" | brute-force scan ~{scan_time / len(probes) * 1e3:9.2f}ms/query"
+        )
+
+
+def naive_matches(trie, text):
+    # Baseline: walk the trie from every start position
+    for start in range(len(text)):
+        node = trie.root
+        for end in range(start, len(text)):
+            node = node.children.get(text[end]) if node.children else None
+            if node is None:
+                break
+            if node.is_end:
+                yield start, text[start : end + 1]
+
+
+def bench_aho_corasick(n, keywords=2_000):
+    print(f"Scanning {n:,} characters for {keywords:,} keywords")
+    rng = random.Random(2)
+    trie = build_trie(random_words(keywords, seed=2))
+    text = "".join(rng.choices(string.ascii_lowercase + " ", k=n))
+    chunks = [text[i : i + 65_536] for i in range(0, n, 65_536)]
+    compile_time, matcher = timed(AhoCorasick, trie)
+    stream_time, found = timed(lambda: sum(1 for _ in matcher.finditer(chunks)))
+    naive_time, expected = timed(lambda: sum(1 for _ in naive_matches(trie, text)))
+    print(
+        f"  compile {compile_time:6.3f}s | chunked finditer {stream_time:7.3f}s"
+        f" | per-position trie walk {naive_time:7.3f}s | matches {found:,}/{expected:,}"
+    )
+
+
+def bench_bulk_build(n):
+    print(f"Building from {n:,} sorted words")
+    words = sorted(set(random_words(n)))
+    path = os.path.join(tempfile.mkdtemp(), "words.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(words) + "\n")
+    insert_time, _ = timed(build_trie, words)
+    sorted_time, _ = timed(Trie.from_sorted, words)
+    print(f"  insert loop {insert_time:8.3f}s | from_sorted {sorted_time:8.3f}s")
+    for workers in (1, 2, 4, 8):
+        parallel_time, _ = timed(Trie.build_parallel, path, workers)
+        print(f"  build_parallel workers={workers}: {parallel_time:8.3f}s")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    bench_complete(n)
+    bench_radix(n)
+    bench_frozen(n)
+    bench_fuzzy(n)
+    bench_aho_corasick(10 * n)
+    bench_bulk_build(n)
@@ -1,29 +1,135 @@
+import threading
+from array import array
 from queue import Queue
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by BinarySearchTree.freeze
+    np = None
+
+RED = "red"
+BLACK = "black"
+NIL = -1  # Empty slot index in ArrayBinarySearchTree
+
 
 class Node:
+    __slots__ = ("data", "left", "right", "parent", "height", "size", "color", "agg")
+
     def __init__(self, data):
         self.data = data
         self.left = None
         self.right = None
         self.parent = None
+        self.height = 1  # Height of the subtree rooted here
+        self.size = 1  # Number of nodes in the subtree rooted here
+        self.color = RED  # Node color (red-black mode)
+        self.agg = None  # Monoid aggregate over the subtree (augmented mode)
+
+
+class PersistentNode:
+    # Parent-free node that is never mutated once built, so it can be shared
+    # between tree versions
+    __slots__ = ("data", "left", "right", "height", "size")
+
+    def __init__(self, data, left=None, right=None):
+        self.data = data
+        self.left = left
+        self.right = right
+        self.height = 1 + max(left.height if left else 0, right.height if right else 0)
+        self.size = 1 + (left.size if left else 0) + (right.size if right else 0)
 
 
 class BinarySearchTree:
-    def __init__(self):
+    def __init__(self, balance=None, monoid=None, measure=None):
+        # balance: None for a plain BST, "avl" or "rb" for a self-balancing tree
+        # monoid: optional (combine, identity) pair aggregated over every subtree,
+        # applied to measure(data) (the key itself when measure is None)
+        if balance not in (None, "avl", "rb"):
+            raise ValueError("balance must be None, 'avl' or 'rb'")
         self.root = None
+        self.balance = balance
+        self.monoid = monoid
+        self.measure = measure if measure is not None else (lambda data: data)
+
+    @classmethod
+    def from_sorted(cls, iterable, balance=None, monoid=None, measure=None):
+        # Time Complexity: O(n)
+        # Builds a height-balanced tree from keys in non-decreasing order
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("Input must be sorted")
+        tree = cls(balance=balance, monoid=monoid, measure=measure)
+        # Every level but the deepest is full, so coloring the deepest level red
+        # and the rest black satisfies the red-black invariants
+        deepest = len(keys).bit_length() - 1
+
+        def _build(lo, hi, parent, depth):
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = Node(keys[mid])
+            node.parent = parent
+            node.color = RED if depth == deepest and depth > 0 else BLACK
+            node.left = _build(lo, mid, node, depth + 1)
+            node.right = _build(mid + 1, hi, node, depth + 1)
+            tree._update(node)
+            return node
+
+        tree.root = _build(0, len(keys), None, 0)
+        return tree
 
     def __repr__(self):
         # Time Complexity: O(n)
-        res = []
-        self.in_order(self.root, res)
-        return " → ".join(map(str, res))
+        return " → ".join(map(str, self))
 
     def __len__(self):
-        # Time Complexity: O(n)
-        res = []
-        self.in_order(self.root, res)
-        return len(res)
+        # Time Complexity: O(1)
+        return self._size(self.root)
+
+    def __iter__(self):
+        # Time Complexity: O(n) for a full scan, O(h) extra memory
+        return self.iter_range()
+
+    def __reversed__(self):
+        # Time Complexity: O(n) for a full scan, O(h) extra memory
+        stack = []
+        cur = self.root
+        while stack or cur is not None:
+            while cur is not None:
+                stack.append(cur)
+                cur = cur.right
+            cur = stack.pop()
+            yield cur.data
+            cur = cur.left
+
+    def iter_range(self, lo=None, hi=None, inclusive=(True, True)):
+        # Time Complexity: O(h + k) for k yielded keys, O(h) extra memory
+        # lo/hi of None leave that side unbounded; inclusive is a bool or a
+        # (lo_inclusive, hi_inclusive) pair
+        if isinstance(inclusive, bool):
+            inclusive = (inclusive, inclusive)
+        lo_inclusive, hi_inclusive = inclusive
+        stack = []
+        cur = self.root
+        # Descend to the lower bound, stacking the nodes that lie above it
+        while cur is not None:
+            if lo is None or lo < cur.data or (lo_inclusive and lo == cur.data):
+                stack.append(cur)
+                cur = cur.left
+            else:
+                cur = cur.right
+        while stack:
+            node = stack.pop()
+            if hi is not None and (
+                hi < node.data or (not hi_inclusive and hi == node.data)
+            ):
+                return
+            yield node.data
+            cur = node.right
+            while cur is not None:
+                stack.append(cur)
+                cur = cur.left
 
     def __contains__(self, data):
         # Time Complexity: O(h), where h is the height of the tree
@@ -42,13 +148,16 @@ class BinarySearchTree:
         return None
 
     def insert(self, data):
-        # Time Complexity: O(h)
+        # Time Complexity: O(h), O(log n) when a balance mode is set
         new_node = Node(data)
+        if self.monoid is not None:
+            self._update(new_node)  # Seed the aggregate before any rotation reads it
         if self.root is None:
             self.root = new_node
         else:
             cur = self.root
             while True:
+                cur.size += 1  # The new node lands below every node on the path
                 if data < cur.data:
                     if cur.left is None:
                         cur.left = new_node
@@ -61,48 +170,443 @@ class BinarySearchTree:
                         new_node.parent = cur
                         break
                     cur = cur.right
+        if self.balance is None and self.monoid is None:
+            self._refresh_path(new_node.parent, 0)
+            return
+        if self.balance == "rb":
+            self._rb_insert_fixup(new_node)
+        # Rotations only refresh the nodes they move, so retrace the whole path
+        self._retrace(new_node)
 
     def delete(self, data):
-        # Time Complexity: O(h)
+        # Time Complexity: O(h), O(log n) when a balance mode is set
         node = self.search(data)
         if node is None:
             raise ValueError("Node not found")
-        if node.left is None and node.right is None:
-            # Case 1: Node is a leaf
-            if node.parent is None:
-                self.root = None
-            elif node.parent.left == node:
-                node.parent.left = None
-            else:
-                node.parent.right = None
-        elif node.left is None:
-            # Case 2: Node has only a right child
-            if node.parent is None:
-                self.root = node.right
-            elif node.parent.left == node:
-                node.parent.left = node.right
+        if node.left is not None and node.right is not None:
+            # Case 4: Node has two children, copy the successor's data into it
+            # and remove the successor instead (it has no left child)
+            successor = self.get_min(node.right)
+            node.data = successor.data
+            node = successor
+        # Cases 1-3: Node is a leaf or has a single child, splice it out
+        child = node.left if node.left is not None else node.right
+        parent = node.parent
+        self._replace_child(parent, node, child)
+        if child is not None:
+            child.parent = parent
+        if self.balance is None and self.monoid is None:
+            self._refresh_path(parent, -1)
+            return
+        if self.balance == "rb" and node.color == BLACK:
+            if child is not None and child.color == RED:
+                child.color = BLACK
             else:
-                node.parent.right = node.right
-            node.right.parent = node.parent
-        elif node.right is None:
-            # Case 3: Node has only a left child
-            if node.parent is None:
-                self.root = node.left
-            elif node.parent.left == node:
-                node.parent.left = node.left
+                self._rb_delete_fixup(child, parent)
+        self._retrace(parent)
+
+    def _replace_child(self, parent, old, new):
+        # Time Complexity: O(1)
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _height(self, node):
+        # Time Complexity: O(1)
+        return node.height if node is not None else 0
+
+    def _size(self, node):
+        # Time Complexity: O(1)
+        return node.size if node is not None else 0
+
+    def _color(self, node):
+        # Time Complexity: O(1)
+        return node.color if node is not None else BLACK  # None leaves are black
+
+    def _update(self, node):
+        # Time Complexity: O(1)
+        left, right = node.left, node.right
+        if left is None:
+            if right is None:
+                node.height = node.size = 1
             else:
-                node.parent.right = node.left
-            node.left.parent = node.parent
+                node.height = 1 + right.height
+                node.size = 1 + right.size
+        elif right is None:
+            node.height = 1 + left.height
+            node.size = 1 + left.size
         else:
-            # Case 4: Node has two children
-            successor = self.get_min(node.right)
-            node.data = successor.data
-            if successor.parent.left == successor:
-                successor.parent.left = successor.right
+            node.height = 1 + (
+                left.height if left.height > right.height else right.height
+            )
+            node.size = 1 + left.size + right.size
+        if self.monoid is not None:
+            combine = self.monoid[0]
+            node.agg = combine(
+                combine(self._agg(left), self.measure(node.data)), self._agg(right)
+            )
+
+    def _agg(self, node):
+        # Time Complexity: O(1)
+        return node.agg if node is not None else self.monoid[1]
+
+    def _rotate_left(self, node):
+        # Time Complexity: O(1)
+        pivot = node.right
+        node.right = pivot.left
+        if pivot.left is not None:
+            pivot.left.parent = node
+        pivot.parent = node.parent
+        self._replace_child(node.parent, node, pivot)
+        pivot.left = node
+        node.parent = pivot
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        # Time Complexity: O(1)
+        pivot = node.left
+        node.left = pivot.right
+        if pivot.right is not None:
+            pivot.right.parent = node
+        pivot.parent = node.parent
+        self._replace_child(node.parent, node, pivot)
+        pivot.right = node
+        node.parent = pivot
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _refresh_path(self, node, size_change):
+        # Time Complexity: O(h)
+        # Plain trees without a monoid: applies size_change to every ancestor
+        # (0 when insert already counted the node on the way down) and refreshes
+        # heights only until one comes out unchanged
+        while node is not None:
+            left = node.left.height if node.left is not None else 0
+            right = node.right.height if node.right is not None else 0
+            height = 1 + (left if left > right else right)
+            if height == node.height:
+                break
+            node.height = height
+            node.size += size_change
+            node = node.parent
+        while size_change and node is not None:
+            node.size += size_change
+            node = node.parent
+
+    def _retrace(self, node):
+        # Time Complexity: O(h)
+        # Walk up to the root, refreshing subtree fields and rotating unbalanced
+        # nodes in AVL mode
+        while node is not None:
+            self._update(node)
+            if self.balance == "avl":
+                node = self._avl_rebalance(node)
+            node = node.parent
+
+    def _avl_rebalance(self, node):
+        # Time Complexity: O(1)
+        skew = self._height(node.left) - self._height(node.right)
+        if skew > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                self._rotate_left(node.left)  # Left-Right case
+            return self._rotate_right(node)
+        if skew < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                self._rotate_right(node.right)  # Right-Left case
+            return self._rotate_left(node)
+        return node
+
+    def _rb_insert_fixup(self, node):
+        # Time Complexity: O(log n)
+        while node.parent is not None and node.parent.color == RED:
+            parent = node.parent
+            grandparent = parent.parent  # A red parent is never the root
+            if parent is grandparent.left:
+                uncle = grandparent.right
+                if self._color(uncle) == RED:
+                    # Case 1: Red uncle, recolor and continue from the grandparent
+                    parent.color = uncle.color = BLACK
+                    grandparent.color = RED
+                    node = grandparent
+                    continue
+                if node is parent.right:
+                    # Case 2: Rotate the node into the outer position
+                    self._rotate_left(parent)
+                    node, parent = parent, node
+                # Case 3: Rotate the grandparent and swap colors
+                parent.color = BLACK
+                grandparent.color = RED
+                self._rotate_right(grandparent)
+            else:
+                uncle = grandparent.left
+                if self._color(uncle) == RED:
+                    parent.color = uncle.color = BLACK
+                    grandparent.color = RED
+                    node = grandparent
+                    continue
+                if node is parent.left:
+                    self._rotate_right(parent)
+                    node, parent = parent, node
+                parent.color = BLACK
+                grandparent.color = RED
+                self._rotate_left(grandparent)
+        self.root.color = BLACK
+
+    def _rb_delete_fixup(self, node, parent):
+        # Time Complexity: O(log n)
+        # node carries an extra black; it may be None, so its parent is passed
+        while node is not self.root and self._color(node) == BLACK:
+            if node is parent.left:
+                sibling = parent.right
+                if sibling.color == RED:
+                    # Case 1: Red sibling, rotate so the sibling becomes black
+                    sibling.color = BLACK
+                    parent.color = RED
+                    self._rotate_left(parent)
+                    sibling = parent.right
+                if (
+                    self._color(sibling.left) == BLACK
+                    and self._color(sibling.right) == BLACK
+                ):
+                    # Case 2: Both nephews black, push the extra black upwards
+                    sibling.color = RED
+                    node, parent = parent, parent.parent
+                    continue
+                if self._color(sibling.right) == BLACK:
+                    # Case 3: Near nephew red, rotate it into the far position
+                    sibling.left.color = BLACK
+                    sibling.color = RED
+                    self._rotate_right(sibling)
+                    sibling = parent.right
+                # Case 4: Far nephew red, rotate the parent and finish
+                sibling.color = parent.color
+                parent.color = BLACK
+                sibling.right.color = BLACK
+                self._rotate_left(parent)
+                node = self.root
+            else:
+                sibling = parent.left
+                if sibling.color == RED:
+                    sibling.color = BLACK
+                    parent.color = RED
+                    self._rotate_right(parent)
+                    sibling = parent.left
+                if (
+                    self._color(sibling.left) == BLACK
+                    and self._color(sibling.right) == BLACK
+                ):
+                    sibling.color = RED
+                    node, parent = parent, parent.parent
+                    continue
+                if self._color(sibling.left) == BLACK:
+                    sibling.right.color = BLACK
+                    sibling.color = RED
+                    self._rotate_left(sibling)
+                    sibling = parent.left
+                sibling.color = parent.color
+                parent.color = BLACK
+                sibling.left.color = BLACK
+                self._rotate_right(parent)
+                node = self.root
+        if node is not None:
+            node.color = BLACK
+
+    def rank(self, data):
+        # Time Complexity: O(h)
+        # Number of keys strictly less than data
+        return self._rank(data, inclusive=False)
+
+    def _rank(self, data, inclusive):
+        # Time Complexity: O(h)
+        rank = 0
+        cur = self.root
+        while cur is not None:
+            if cur.data < data or (inclusive and cur.data == data):
+                rank += self._size(cur.left) + 1
+                cur = cur.right
+            else:
+                cur = cur.left
+        return rank
+
+    def select(self, index):
+        # Time Complexity: O(h)
+        # Returns the index-th smallest key (0-based, negative counts from the end)
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Index out of range")
+        cur = self.root
+        while True:
+            left_size = self._size(cur.left)
+            if index < left_size:
+                cur = cur.left
+            elif index == left_size:
+                return cur.data
+            else:
+                index -= left_size + 1
+                cur = cur.right
+
+    def count_range(self, lo, hi):
+        # Time Complexity: O(h)
+        # Number of keys k with lo <= k <= hi
+        return max(0, self._rank(hi, inclusive=True) - self._rank(lo, inclusive=False))
+
+    def floor(self, data):
+        # Time Complexity: O(h)
+        # Largest key <= data, or None
+        return self._floor(data, inclusive=True)
+
+    def ceiling(self, data):
+        # Time Complexity: O(h)
+        # Smallest key >= data, or None
+        return self._ceiling(data, inclusive=True)
+
+    def predecessor(self, data):
+        # Time Complexity: O(h)
+        # Largest key < data, or None
+        return self._floor(data, inclusive=False)
+
+    def successor(self, data):
+        # Time Complexity: O(h)
+        # Smallest key > data, or None
+        return self._ceiling(data, inclusive=False)
+
+    def _floor(self, data, inclusive):
+        # Time Complexity: O(h)
+        best = None
+        cur = self.root
+        while cur is not None:
+            if cur.data < data or (inclusive and cur.data == data):
+                best = cur
+                cur = cur.right
             else:
-                successor.parent.right = successor.right
-            if successor.right is not None:
-                successor.right.parent = successor.parent
+                cur = cur.left
+        return best.data if best is not None else None
+
+    def _ceiling(self, data, inclusive):
+        # Time Complexity: O(h)
+        best = None
+        cur = self.root
+        while cur is not None:
+            if data < cur.data or (inclusive and cur.data == data):
+                best = cur
+                cur = cur.left
+            else:
+                cur = cur.right
+        return best.data if best is not None else None
+
+    def aggregate(self, lo=None, hi=None):
+        # Time Complexity: O(h)
+        # Combines measure(k) over keys lo <= k <= hi in key order; lo/hi of
+        # None leave that side unbounded
+        if self.monoid is None:
+            raise ValueError("Tree has no monoid")
+        combine, identity = self.monoid
+        # Find the topmost node inside the range, where the bounds split
+        node = self.root
+        while node is not None:
+            if lo is not None and node.data < lo:
+                node = node.right
+            elif hi is not None and hi < node.data:
+                node = node.left
+            else:
+                break
+        if node is None:
+            return identity
+        # Keys >= lo in the left subtree, accumulated right to left
+        left = identity
+        cur = node.left
+        while cur is not None:
+            if lo is None or not cur.data < lo:
+                left = combine(
+                    combine(self.measure(cur.data), self._agg(cur.right)), left
+                )
+                cur = cur.left
+            else:
+                cur = cur.right
+        # Keys <= hi in the right subtree, accumulated left to right
+        right = identity
+        cur = node.right
+        while cur is not None:
+            if hi is None or not hi < cur.data:
+                right = combine(
+                    right, combine(self._agg(cur.left), self.measure(cur.data))
+                )
+                cur = cur.right
+            else:
+                cur = cur.left
+        return combine(combine(left, self.measure(node.data)), right)
+
+    def freeze(self, key=None, payload=None, dtype=None):
+        # Time Complexity: O(n)
+        # Exports the keys (key(data) if given) as a sorted NumPy array, with an
+        # optional parallel array of payload(data)
+        if np is None:
+            raise ImportError("freeze requires NumPy")
+        items = list(self)
+        keys = np.array([key(data) for data in items] if key else items, dtype=dtype)
+        values = np.array([payload(data) for data in items]) if payload else None
+        return FrozenIndex(keys, values)
+
+    def union(self, other):
+        # Time Complexity: O(n + m)
+        # Set operations drop repeated keys and keep this tree's configuration
+        merged = self._merge(self, other, True, True, True)
+        return self._rebuild(merged)
+
+    def intersection(self, other):
+        # Time Complexity: O(n + m)
+        merged = self._merge(self, other, False, True, False)
+        return self._rebuild(merged)
+
+    def difference(self, other):
+        # Time Complexity: O(n + m)
+        merged = self._merge(self, other, True, False, False)
+        return self._rebuild(merged)
+
+    def _rebuild(self, keys):
+        # Time Complexity: O(n)
+        return self.from_sorted(keys, self.balance, self.monoid, self.measure)
+
+    @staticmethod
+    def _unique(keys):
+        # Time Complexity: O(n)
+        marker = last = object()
+        for key in keys:
+            if last is marker or last != key:
+                yield key
+            last = key
+
+    @classmethod
+    def _merge(cls, left, right, keep_left, keep_both, keep_right):
+        # Time Complexity: O(n + m)
+        # Walks two sorted key streams in lockstep, yielding keys found only on
+        # the left, on both sides or only on the right as requested
+        end = object()
+        left = cls._unique(left)
+        right = cls._unique(right)
+        a = next(left, end)
+        b = next(right, end)
+        while a is not end or b is not end:
+            if b is end or (a is not end and a < b):
+                if keep_left:
+                    yield a
+                a = next(left, end)
+            elif a is end or b < a:
+                if keep_right:
+                    yield b
+                b = next(right, end)
+            else:
+                if keep_both:
+                    yield a
+                a = next(left, end)
+                b = next(right, end)
 
     def get_min(self, node):
         # Time Complexity: O(h)
@@ -112,37 +616,69 @@ class BinarySearchTree:
 
     def in_order(self, node, res):
         # Time Complexity: O(n)
-        if node is not None:
-            self.in_order(node.left, res)
+        stack = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
             res.append(node.data)
-            self.in_order(node.right, res)
+            node = node.right
 
     def pre_order(self, node, res):
         # Time Complexity: O(n)
-        if node is not None:
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
             res.append(node.data)
-            self.pre_order(node.left, res)
-            self.pre_order(node.right, res)
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
 
     def post_order(self, node, res):
         # Time Complexity: O(n)
-        if node is not None:
-            self.post_order(node.left, res)
-            self.post_order(node.right, res)
-            res.append(node.data)
+        # Visit root, right, left and emit the reverse of that order
+        out = []
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            out.append(node.data)
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        res.extend(reversed(out))
 
     def height(self, node):
-        # Time Complexity: O(n)
-        if node is None:
-            return 0
-        return 1 + max(self.height(node.left), self.height(node.right))
+        # Time Complexity: O(1), every node tracks its subtree height
+        return self._height(node)
 
     def is_balanced(self):
         # Time Complexity: O(n)
         if self.root is None:
             return True
+        if self.balance == "rb":
+            # A red-black tree is balanced when its coloring invariants hold
+            return self.root.color == BLACK and self._black_height(self.root) != -1
         return abs(self.height(self.root.left) - self.height(self.root.right)) <= 1
 
+    def _black_height(self, node):
+        # Time Complexity: O(n)
+        # Returns -1 if a red node has a red child or black heights differ
+        if node is None:
+            return 1
+        if node.color == RED and RED in (
+            self._color(node.left),
+            self._color(node.right),
+        ):
+            return -1
+        left = self._black_height(node.left)
+        right = self._black_height(node.right)
+        if left == -1 or left != right:
+            return -1
+        return left + (node.color == BLACK)
+
     def is_full(self):
         # Time Complexity: O(n)
         if self.root is None:
@@ -209,6 +745,630 @@ class BinarySearchTree:
         )
 
 
+class FrozenIndex:
+    # Read-only sorted key array answering batches of queries with searchsorted
+    def __init__(self, keys, payload=None):
+        self.keys = keys
+        self.payload = payload  # payload[i] belongs to keys[i]
+        self.cast_keys = {keys.dtype: keys}  # keys converted to wider probe dtypes
+
+    def __repr__(self):
+        # Time Complexity: O(n)
+        return " → ".join(map(str, self.keys.tolist()))
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        return len(self.keys)
+
+    def search_many(self, probes):
+        # Time Complexity: O(m log n) for m probes, vectorized
+        # Returns the position of each probe in keys (and payload), or -1
+        keys, (probes,), usable = self._common((probes, None))
+        if len(keys) == 0:
+            return np.full(probes.shape, -1, dtype=np.intp)
+        positions = np.searchsorted(keys, probes, side="left")
+        clipped = np.minimum(positions, len(keys) - 1)
+        found = usable & (positions < len(keys)) & (keys[clipped] == probes)
+        return np.where(found, positions, -1)
+
+    def contains_many(self, probes):
+        # Time Complexity: O(m log n)
+        return self.search_many(probes) >= 0
+
+    def count_range_many(self, los, his):
+        # Time Complexity: O(m log n)
+        # Number of keys k with lo <= k <= hi for each (lo, hi) pair
+        keys, (los, his), usable = self._common((los, np.ceil), (his, np.floor))
+        counts = np.searchsorted(keys, his, side="right") - np.searchsorted(
+            keys, los, side="left"
+        )
+        return np.where(usable, np.maximum(counts, 0), 0)
+
+    def _common(self, *queries):
+        # Time Complexity: O(m), plus O(n) the first time a dtype is seen
+        # Takes (query, rounding) pairs, rounding being np.ceil for lower
+        # bounds, np.floor for upper bounds and None for exact probes. Returns
+        # keys and queries in one dtype, so that "applesauce" is not truncated
+        # onto "apple", plus a mask of the queries that can match at all
+        values = []
+        for query, _ in queries:
+            query = np.asarray(query)
+            # An empty list defaults to float64; give it the key dtype instead
+            values.append(query.astype(self.keys.dtype) if query.size == 0 else query)
+        usable = np.ones(np.broadcast(*values).shape, dtype=bool)
+        if self.keys.dtype.kind in "iu":
+            # The common dtype of integer keys and float probes is a float,
+            # which rounds large keys (2**53 + 1 onto 2**53), so such queries
+            # move to the key dtype instead
+            for index, (_, rounding) in enumerate(queries):
+                query = values[index]
+                if query.dtype.kind in "iuf" and not np.can_cast(
+                    query.dtype, self.keys.dtype
+                ):
+                    values[index], in_range = self._to_key_dtype(query, rounding)
+                    usable &= in_range
+        dtype = np.result_type(self.keys, *values)
+        keys = self.cast_keys.get(dtype)
+        if keys is None:
+            keys = self.cast_keys[dtype] = self.keys.astype(dtype)
+        return keys, [value.astype(dtype, copy=False) for value in values], usable
+
+    def _to_key_dtype(self, query, rounding):
+        # Time Complexity: O(m)
+        # Casts float or wider integer queries to the integer key dtype. Bounds
+        # past the near end of the key range are clamped to it; the mask drops
+        # bounds past the far end, and probes that are out of range, NaN or
+        # not integral (2.5 would otherwise truncate onto 2)
+        info = np.iinfo(self.keys.dtype)
+        if query.dtype.kind == "f":
+            whole = query if rounding is None else rounding(query)
+            # info.max + 1 is a power of two, so unlike info.max it is exact
+            below, above = whole < info.min, whole >= float(info.max + 1)
+            usable = whole == np.floor(whole)  # False for NaN
+        else:
+            whole = query
+            below, above = whole < info.min, whole > info.max
+            usable = np.ones(query.shape, dtype=bool)
+        if rounding is None:
+            usable &= ~below & ~above
+        elif rounding is np.ceil:
+            usable &= ~above
+        else:
+            usable &= ~below
+        cast = np.full(query.shape, info.min, dtype=self.keys.dtype)
+        cast[above] = info.max
+        inside = usable & ~below & ~above
+        cast[inside] = whole[inside].astype(self.keys.dtype)
+        return cast, usable
+
+
+class PersistentBinarySearchTree(BinarySearchTree):
+    # AVL tree whose insert/delete copy the O(log n) nodes on the search path
+    # and share every untouched subtree, so old versions stay intact
+    def __init__(self):
+        super().__init__(balance="avl")
+        self.frozen = False
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        # Time Complexity: O(n)
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("Input must be sorted")
+
+        def _build(lo, hi):
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            return PersistentNode(keys[mid], _build(lo, mid), _build(mid + 1, hi))
+
+        tree = cls()
+        tree.root = _build(0, len(keys))
+        return tree
+
+    def snapshot(self):
+        # Time Complexity: O(1)
+        # Returns a read-only version sharing all nodes with this tree
+        snap = PersistentBinarySearchTree()
+        snap.root = self.root
+        snap.frozen = True
+        return snap
+
+    def insert(self, data):
+        # Time Complexity: O(log n), copies O(log n) nodes
+        self._check_writable()
+        # The new root is published in one assignment, after the copy is built
+        self.root = self._insert(self.root, data)
+
+    def delete(self, data):
+        # Time Complexity: O(log n), copies O(log n) nodes
+        self._check_writable()
+        self.root = self._delete(self.root, data)
+
+    def _check_writable(self):
+        # Time Complexity: O(1)
+        if self.frozen:
+            raise TypeError("Snapshot is read-only")
+
+    def _rebuild(self, keys):
+        # Time Complexity: O(n)
+        return self.from_sorted(keys)
+
+    def _insert(self, node, data):
+        # Time Complexity: O(log n)
+        if node is None:
+            return PersistentNode(data)
+        if data < node.data:
+            return self._join(node.data, self._insert(node.left, data), node.right)
+        return self._join(node.data, node.left, self._insert(node.right, data))
+
+    def _delete(self, node, data):
+        # Time Complexity: O(log n)
+        if node is None:
+            raise ValueError("Node not found")
+        if data < node.data:
+            return self._join(node.data, self._delete(node.left, data), node.right)
+        if node.data < data:
+            return self._join(node.data, node.left, self._delete(node.right, data))
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        # Two children: the successor moves up into a fresh copy of this node
+        right, successor = self._pop_min(node.right)
+        return self._join(successor, node.left, right)
+
+    def _pop_min(self, node):
+        # Time Complexity: O(log n)
+        # Returns the subtree without its smallest key, and that key
+        if node.left is None:
+            return node.right, node.data
+        left, smallest = self._pop_min(node.left)
+        return self._join(node.data, left, node.right), smallest
+
+    def _join(self, data, left, right):
+        # Time Complexity: O(1)
+        # Builds a node over left and right, rotating if their heights differ by 2
+        left_height, right_height = self._height(left), self._height(right)
+        if left_height > right_height + 1:
+            if self._height(left.left) >= self._height(left.right):
+                return PersistentNode(
+                    left.data, left.left, PersistentNode(data, left.right, right)
+                )
+            pivot = left.right  # Left-Right case
+            return PersistentNode(
+                pivot.data,
+                PersistentNode(left.data, left.left, pivot.left),
+                PersistentNode(data, pivot.right, right),
+            )
+        if right_height > left_height + 1:
+            if self._height(right.right) >= self._height(right.left):
+                return PersistentNode(
+                    right.data, PersistentNode(data, left, right.left), right.right
+                )
+            pivot = right.left  # Right-Left case
+            return PersistentNode(
+                pivot.data,
+                PersistentNode(data, left, pivot.left),
+                PersistentNode(right.data, pivot.right, right.right),
+            )
+        return PersistentNode(data, left, right)
+
+
+class ConcurrentBinarySearchTree(PersistentBinarySearchTree):
+    # Readers walk whichever immutable version is current when they start, so
+    # they never block and never see a half-applied update; writers serialize
+    # on a lock and publish each new version with a single root assignment
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+
+    def insert(self, data):
+        # Time Complexity: O(log n)
+        with self.lock:
+            super().insert(data)
+
+    def delete(self, data):
+        # Time Complexity: O(log n)
+        with self.lock:
+            super().delete(data)
+
+    def select(self, index):
+        # Time Complexity: O(log n)
+        # Pin one version so the bounds check and the walk agree
+        return self.snapshot().select(index)
+
+    def count_range(self, lo, hi):
+        # Time Complexity: O(log n)
+        return self.snapshot().count_range(lo, hi)
+
+
+class ArrayBinarySearchTree:
+    # BinarySearchTree whose nodes are slots in parallel arrays instead of
+    # individual objects; slots freed by delete are reused. Methods that take
+    # or return a node use its slot index, with NIL for no node. Has the
+    # baseline BinarySearchTree API plus from_sorted, iter_range and
+    # rank/select, in plain and AVL modes only
+    def __init__(self, balance=None):
+        # balance: None for a plain BST or "avl" for a self-balancing tree
+        if balance not in (None, "avl"):
+            raise ValueError("balance must be None or 'avl'")
+        self.root = NIL
+        self.balance = balance
+        self.keys = []  # Key column
+        self.left = array("q")
+        self.right = array("q")
+        self.parent = array("q")
+        self.size = array("q")
+        self.heights = array("i")
+        self.free = NIL  # Head of the free list, threaded through self.right
+
+    @classmethod
+    def from_sorted(cls, iterable, balance=None):
+        # Time Complexity: O(n)
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("Input must be sorted")
+        tree = cls(balance=balance)
+
+        def _build(lo, hi, parent):
+            if lo >= hi:
+                return NIL
+            mid = (lo + hi) // 2
+            slot = tree._alloc(keys[mid], parent)
+            tree.left[slot] = _build(lo, mid, slot)
+            tree.right[slot] = _build(mid + 1, hi, slot)
+            tree._update(slot)
+            return slot
+
+        tree.root = _build(0, len(keys), NIL)
+        return tree
+
+    def __repr__(self):
+        # Time Complexity: O(n)
+        return " → ".join(map(str, self))
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        return self._size(self.root)
+
+    def __iter__(self):
+        # Time Complexity: O(n) for a full scan, O(h) extra memory
+        return self.iter_range()
+
+    def __contains__(self, data):
+        # Time Complexity: O(h)
+        return self.search(data) is not None
+
+    def iter_range(self, lo=None, hi=None, inclusive=(True, True)):
+        # Time Complexity: O(h + k) for k yielded keys, O(h) extra memory
+        if isinstance(inclusive, bool):
+            inclusive = (inclusive, inclusive)
+        lo_inclusive, hi_inclusive = inclusive
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        cur = self.root
+        while cur != NIL:
+            key = keys[cur]
+            if lo is None or lo < key or (lo_inclusive and lo == key):
+                stack.append(cur)
+                cur = left[cur]
+            else:
+                cur = right[cur]
+        while stack:
+            slot = stack.pop()
+            key = keys[slot]
+            if hi is not None and (hi < key or (not hi_inclusive and hi == key)):
+                return
+            yield key
+            cur = right[slot]
+            while cur != NIL:
+                stack.append(cur)
+                cur = left[cur]
+
+    def search(self, data):
+        # Time Complexity: O(h)
+        # Returns the slot holding data, or None
+        keys, left, right = self.keys, self.left, self.right
+        cur = self.root
+        while cur != NIL:
+            key = keys[cur]
+            if data == key:
+                return cur
+            cur = left[cur] if data < key else right[cur]
+        return None
+
+    def insert(self, data):
+        # Time Complexity: O(h), O(log n) in AVL mode
+        if self.root == NIL:
+            self.root = self._alloc(data, NIL)
+            return
+        keys, left, right = self.keys, self.left, self.right
+        cur = self.root
+        while True:
+            if data < keys[cur]:
+                if left[cur] == NIL:
+                    left[cur] = self._alloc(data, cur)
+                    break
+                cur = left[cur]
+            else:
+                if right[cur] == NIL:
+                    right[cur] = self._alloc(data, cur)
+                    break
+                cur = right[cur]
+        self._retrace(cur)
+
+    def delete(self, data):
+        # Time Complexity: O(h), O(log n) in AVL mode
+        slot = self.search(data)
+        if slot is None:
+            raise ValueError("Node not found")
+        left, right = self.left, self.right
+        if left[slot] != NIL and right[slot] != NIL:
+            # Two children: take over the successor's key, remove the successor
+            successor = self.get_min(right[slot])
+            self.keys[slot] = self.keys[successor]
+            slot = successor
+        child = left[slot] if left[slot] != NIL else right[slot]
+        parent = self.parent[slot]
+        self._replace_child(parent, slot, child)
+        if child != NIL:
+            self.parent[child] = parent
+        self._release(slot)
+        self._retrace(parent)
+
+    def rank(self, data):
+        # Time Complexity: O(h)
+        # Number of keys strictly less than data
+        rank = 0
+        cur = self.root
+        while cur != NIL:
+            if self.keys[cur] < data:
+                rank += self._size(self.left[cur]) + 1
+                cur = self.right[cur]
+            else:
+                cur = self.left[cur]
+        return rank
+
+    def select(self, index):
+        # Time Complexity: O(h)
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Index out of range")
+        cur = self.root
+        while True:
+            left_size = self._size(self.left[cur])
+            if index < left_size:
+                cur = self.left[cur]
+            elif index == left_size:
+                return self.keys[cur]
+            else:
+                index -= left_size + 1
+                cur = self.right[cur]
+
+    def get_min(self, slot):
+        # Time Complexity: O(h)
+        while self.left[slot] != NIL:
+            slot = self.left[slot]
+        return slot
+
+    def in_order(self, slot, res):
+        # Time Complexity: O(n)
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        while stack or slot != NIL:
+            while slot != NIL:
+                stack.append(slot)
+                slot = left[slot]
+            slot = stack.pop()
+            res.append(keys[slot])
+            slot = right[slot]
+
+    def pre_order(self, slot, res):
+        # Time Complexity: O(n)
+        keys, left, right = self.keys, self.left, self.right
+        stack = [slot] if slot != NIL else []
+        while stack:
+            slot = stack.pop()
+            res.append(keys[slot])
+            if right[slot] != NIL:
+                stack.append(right[slot])
+            if left[slot] != NIL:
+                stack.append(left[slot])
+
+    def post_order(self, slot, res):
+        # Time Complexity: O(n)
+        # Visit root, right, left and emit the reverse of that order
+        keys, left, right = self.keys, self.left, self.right
+        out = []
+        stack = [slot] if slot != NIL else []
+        while stack:
+            slot = stack.pop()
+            out.append(keys[slot])
+            if left[slot] != NIL:
+                stack.append(left[slot])
+            if right[slot] != NIL:
+                stack.append(right[slot])
+        res.extend(reversed(out))
+
+    def height(self, slot):
+        # Time Complexity: O(1)
+        return self._height(slot)
+
+    def is_balanced(self):
+        # Time Complexity: O(1), every slot tracks its subtree height
+        if self.root == NIL:
+            return True
+        root = self.root
+        return abs(self._height(self.left[root]) - self._height(self.right[root])) <= 1
+
+    def is_full(self):
+        # Time Complexity: O(n)
+        # Every node has either no children or two
+        left, right = self.left, self.right
+        return all(
+            (left[slot] == NIL) == (right[slot] == NIL) for slot in self._slots()
+        )
+
+    def is_perfect(self):
+        # Time Complexity: O(n)
+        # Same check as BinarySearchTree.is_perfect
+        return self.is_full()
+
+    def is_complete(self):
+        # Time Complexity: O(n)
+        if self.root == NIL:
+            return True
+        left, right = self.left, self.right
+        q = Queue()
+        q.put(self.root)
+        flag = False
+        while not q.empty():
+            slot = q.get()
+            if flag and (left[slot] != NIL or right[slot] != NIL):
+                return False
+            if left[slot] == NIL and right[slot] != NIL:
+                return False
+            if left[slot] != NIL:
+                q.put(left[slot])
+            else:
+                flag = True
+            if right[slot] != NIL:
+                q.put(right[slot])
+            else:
+                flag = True
+        return True
+
+    def is_bst(self):
+        # Time Complexity: O(n)
+        # Every key lies strictly between the bounds set by its ancestors
+        keys, left, right = self.keys, self.left, self.right
+        stack = [(self.root, float("-inf"), float("inf"))] if self.root != NIL else []
+        while stack:
+            slot, min_val, max_val = stack.pop()
+            key = keys[slot]
+            if key <= min_val or key >= max_val:
+                return False
+            if left[slot] != NIL:
+                stack.append((left[slot], min_val, key))
+            if right[slot] != NIL:
+                stack.append((right[slot], key, max_val))
+        return True
+
+    def _slots(self):
+        # Time Complexity: O(n)
+        # Yields every live slot, parents before children
+        left, right = self.left, self.right
+        stack = [self.root] if self.root != NIL else []
+        while stack:
+            slot = stack.pop()
+            yield slot
+            if left[slot] != NIL:
+                stack.append(left[slot])
+            if right[slot] != NIL:
+                stack.append(right[slot])
+
+    def _alloc(self, data, parent):
+        # Time Complexity: O(1) amortized
+        slot = self.free
+        if slot == NIL:
+            slot = len(self.keys)
+            self.keys.append(data)
+            self.left.append(NIL)
+            self.right.append(NIL)
+            self.parent.append(parent)
+            self.size.append(1)
+            self.heights.append(1)
+            return slot
+        self.free = self.right[slot]
+        self.keys[slot] = data
+        self.left[slot] = self.right[slot] = NIL
+        self.parent[slot] = parent
+        self.size[slot] = self.heights[slot] = 1
+        return slot
+
+    def _release(self, slot):
+        # Time Complexity: O(1)
+        self.keys[slot] = None  # Drop the reference so the key can be collected
+        self.right[slot] = self.free
+        self.free = slot
+
+    def _replace_child(self, parent, old, new):
+        # Time Complexity: O(1)
+        if parent == NIL:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+
+    def _size(self, slot):
+        # Time Complexity: O(1)
+        return self.size[slot] if slot != NIL else 0
+
+    def _height(self, slot):
+        # Time Complexity: O(1)
+        return self.heights[slot] if slot != NIL else 0
+
+    def _update(self, slot):
+        # Time Complexity: O(1)
+        left, right = self.left[slot], self.right[slot]
+        self.heights[slot] = 1 + max(self._height(left), self._height(right))
+        self.size[slot] = 1 + self._size(left) + self._size(right)
+
+    def _rotate_left(self, slot):
+        # Time Complexity: O(1)
+        left, right, parent = self.left, self.right, self.parent
+        pivot = right[slot]
+        right[slot] = left[pivot]
+        if left[pivot] != NIL:
+            parent[left[pivot]] = slot
+        parent[pivot] = parent[slot]
+        self._replace_child(parent[slot], slot, pivot)
+        left[pivot] = slot
+        parent[slot] = pivot
+        self._update(slot)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, slot):
+        # Time Complexity: O(1)
+        left, right, parent = self.left, self.right, self.parent
+        pivot = left[slot]
+        left[slot] = right[pivot]
+        if right[pivot] != NIL:
+            parent[right[pivot]] = slot
+        parent[pivot] = parent[slot]
+        self._replace_child(parent[slot], slot, pivot)
+        right[pivot] = slot
+        parent[slot] = pivot
+        self._update(slot)
+        self._update(pivot)
+        return pivot
+
+    def _retrace(self, slot):
+        # Time Complexity: O(h)
+        left, right = self.left, self.right
+        while slot != NIL:
+            self._update(slot)
+            if self.balance == "avl":
+                skew = self._height(left[slot]) - self._height(right[slot])
+                if skew > 1:
+                    child = left[slot]
+                    if self._height(left[child]) < self._height(right[child]):
+                        self._rotate_left(child)
+                    slot = self._rotate_right(slot)
+                elif skew < -1:
+                    child = right[slot]
+                    if self._height(right[child]) < self._height(left[child]):
+                        self._rotate_right(child)
+                    slot = self._rotate_left(slot)
+            slot = self.parent[slot]
+
+
 if __name__ == "__main__":
     # Initialize BST and insert nodes
     bst = BinarySearchTree()
@@ -237,6 +1397,24 @@ if __name__ == "__main__":
     # Test __len__
     print("Number of nodes in BST (len):", len(bst))
 
+    # Test order statistics
+    print("Rank of 12 (keys below it):", bst.rank(12))
+    print("Select index 2 (third smallest):", bst.select(2))
+    print("Keys in range [5, 12]:", bst.count_range(5, 12))
+
+    # Test lazy iteration and neighbor queries
+    print("Reversed keys:", list(reversed(bst)))
+    print(
+        "Keys in range [5, 12):", list(bst.iter_range(5, 12, inclusive=(True, False)))
+    )
+    print("Floor of 11:", bst.floor(11), "| Ceiling of 11:", bst.ceiling(11))
+    print(
+        "Predecessor of 10:",
+        bst.predecessor(10),
+        "| Successor of 10:",
+        bst.successor(10),
+    )
+
     # Test is_balanced
     print("Is BST balanced?", bst.is_balanced())
 
@@ -252,6 +1430,81 @@ if __name__ == "__main__":
     # Test is_bst
     print("Is BST valid?", bst.is_bst())
 
+    # Test self-balancing modes with sorted input
+    for mode in ("avl", "rb"):
+        balanced = BinarySearchTree(balance=mode)
+        for key in range(1, 16):
+            balanced.insert(key)
+        print(
+            f"{mode.upper()} height after sorted inserts:",
+            balanced.height(balanced.root),
+        )
+        print(f"Is {mode.upper()} BST balanced?", balanced.is_balanced())
+
+    # Test bulk loading and set operations
+    evens = BinarySearchTree.from_sorted(range(0, 20, 2))
+    threes = BinarySearchTree.from_sorted(range(0, 20, 3))
+    print("Bulk-loaded height for 10 keys:", evens.height(evens.root))
+    print("Union:", evens.union(threes))
+    print("Intersection:", evens.intersection(threes))
+    print("Difference:", evens.difference(threes))
+
+    # Test range aggregates over (timestamp, value) pairs
+    readings = BinarySearchTree(
+        balance="rb", monoid=(max, float("-inf")), measure=lambda p: p[1]
+    )
+    for reading in [(1, 4.0), (2, 9.5), (3, 1.5), (4, 7.0), (5, 3.0)]:
+        readings.insert(reading)
+    print("Max value for timestamps 2-4:", readings.aggregate((2,), (4, float("inf"))))
+
+    # Test the frozen NumPy index
+    if np is not None:
+        index = readings.freeze(key=lambda p: p[0], payload=lambda p: p[1])
+        positions = index.search_many([2, 6, 4])
+        print("Frozen positions for timestamps [2, 6, 4]:", positions.tolist())
+        print("Payload of timestamp 4:", index.payload[positions[2]])
+        print(
+            "Counts for [1, 3] and [4, 9]:",
+            index.count_range_many([1, 4], [3, 9]).tolist(),
+        )
+
+    # Test persistent snapshots
+    live = PersistentBinarySearchTree.from_sorted([10, 20, 30])
+    frozen = live.snapshot()
+    live.insert(25)
+    live.delete(10)
+    print("Live tree after updates:", live)
+    print("Snapshot taken before updates:", frozen)
+
+    # Test concurrent readers alongside a writer thread
+    shared = ConcurrentBinarySearchTree.from_sorted(range(0, 100, 2))
+    writer = threading.Thread(
+        target=lambda: [shared.insert(k) for k in range(1, 100, 2)]
+    )
+    writer.start()
+    seen = [len(list(shared.iter_range(0, 99))) for _ in range(3)]
+    writer.join()
+    print("Range scan sizes while writing:", seen, "| final size:", len(shared))
+
+    # Test the array-backed tree
+    compact = ArrayBinarySearchTree(balance="avl")
+    for key in range(1, 16):
+        compact.insert(key)
+    compact.delete(8)
+    compact.insert(20)  # Reuses the slot freed by delete
+    print("Array-backed BST:", compact)
+    print(
+        "Array-backed height and slots:",
+        compact.height(compact.root),
+        len(compact.keys),
+    )
+    compact_pre_order = []
+    compact.pre_order(compact.root, compact_pre_order)
+    print("Array-backed pre-order:", compact_pre_order)
+    print(
+        "Array-backed is balanced and a BST:", compact.is_balanced(), compact.is_bst()
+    )
+
     # Test traversals
     in_order_res = []
     pre_order_res = []
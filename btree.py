@@ -0,0 +1,251 @@
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+
+class Node:
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys=None, children=None):
+        self.keys = keys if keys is not None else []  # Sorted keys
+        self.children = children if children is not None else []  # Empty for leaves
+
+
+class BTree:
+    def __init__(self, order=64):
+        # order: maximum number of children per node (fan-out); splitting a full
+        # node into two halves around its median needs an even order
+        if order < 4 or order % 2:
+            raise ValueError("order must be an even number of at least 4")
+        self.root = Node()
+        self.min_degree = order // 2
+        self.max_keys = 2 * self.min_degree - 1
+        self.size = 0
+
+    def __repr__(self):
+        # Time Complexity: O(n)
+        return " → ".join(map(str, self))
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        return self.size
+
+    def __iter__(self):
+        # Time Complexity: O(n) for a full scan, O(log n) extra memory
+        return self.iter_range()
+
+    def __contains__(self, data):
+        # Time Complexity: O(log n)
+        return self.search(data) is not None
+
+    def search(self, data):
+        # Time Complexity: O(log n), O(log_order n) node hops
+        # Returns the node holding data, or None
+        node = self.root
+        while True:
+            i = bisect_left(node.keys, data)
+            if i < len(node.keys) and node.keys[i] == data:
+                return node
+            if not node.children:
+                return None
+            node = node.children[i]
+
+    def iter_range(self, lo=None, hi=None, inclusive=(True, True)):
+        # Time Complexity: O(log n + k) for k yielded keys
+        # lo/hi of None leave that side unbounded; inclusive is a bool or a
+        # (lo_inclusive, hi_inclusive) pair
+        if isinstance(inclusive, bool):
+            inclusive = (inclusive, inclusive)
+        lo_inclusive, hi_inclusive = inclusive
+        # Each stack entry (node, i) means keys[i] is the next key to emit there
+        stack = []
+        node = self.root
+        while True:
+            if lo is None:
+                i = 0
+            elif lo_inclusive:
+                i = bisect_left(node.keys, lo)
+            else:
+                i = bisect_right(node.keys, lo)
+            stack.append((node, i))
+            if not node.children:
+                break
+            node = node.children[i]
+        while stack:
+            node, i = stack.pop()
+            if not node.children:
+                # Leaves emit a whole run of keys without touching the stack
+                for key in islice(node.keys, i, None):
+                    if hi is not None and (
+                        hi < key or (not hi_inclusive and hi == key)
+                    ):
+                        return
+                    yield key
+                continue
+            if i >= len(node.keys):
+                continue
+            key = node.keys[i]
+            if hi is not None and (hi < key or (not hi_inclusive and hi == key)):
+                return
+            yield key
+            stack.append((node, i + 1))
+            child = node.children[i + 1]
+            while True:
+                stack.append((child, 0))
+                if not child.children:
+                    break
+                child = child.children[0]
+
+    def insert(self, data):
+        # Time Complexity: O(order · log_order n)
+        # Full nodes are split on the way down so the parent always has room
+        if len(self.root.keys) == self.max_keys:
+            self.root = Node(children=[self.root])
+            self._split_child(self.root, 0)
+        node = self.root
+        while node.children:
+            i = bisect_right(node.keys, data)
+            if len(node.children[i].keys) == self.max_keys:
+                self._split_child(node, i)
+                if not data < node.keys[i]:
+                    i += 1
+            node = node.children[i]
+        node.keys.insert(bisect_right(node.keys, data), data)
+        self.size += 1
+
+    def delete(self, data):
+        # Time Complexity: O(order · log_order n)
+        # Every node entered on the way down holds at least min_degree keys, so
+        # removing one never leaves a node underfull
+        t = self.min_degree
+        node = self.root
+        while True:
+            i = bisect_left(node.keys, data)
+            found = i < len(node.keys) and node.keys[i] == data
+            if not node.children:
+                if found:
+                    del node.keys[i]
+                break
+            if found:
+                left, right = node.children[i], node.children[i + 1]
+                if len(left.keys) >= t:
+                    # Case 1: Replace with the predecessor and delete that instead
+                    data = node.keys[i] = self._max_key(left)
+                    node = left
+                elif len(right.keys) >= t:
+                    # Case 2: Replace with the successor and delete that instead
+                    data = node.keys[i] = self._min_key(right)
+                    node = right
+                else:
+                    # Case 3: Merge both children around the key, continue below
+                    self._merge_children(node, i)
+                    node = left
+                continue
+            child = node.children[i]
+            if len(child.keys) < t:
+                # Top up the child from a sibling, or merge it with one
+                if i > 0 and len(node.children[i - 1].keys) >= t:
+                    self._borrow_from_left(node, i)
+                elif i < len(node.keys) and len(node.children[i + 1].keys) >= t:
+                    self._borrow_from_right(node, i)
+                elif i < len(node.keys):
+                    self._merge_children(node, i)
+                else:
+                    child = node.children[i - 1]
+                    self._merge_children(node, i - 1)
+            node = child
+        # A merge on the way down may have emptied the root, even when the key
+        # turns out to be missing
+        if not self.root.keys and self.root.children:
+            self.root = self.root.children[0]  # Shrink the tree by one level
+        if not found:
+            raise ValueError("Key not found")
+        self.size -= 1
+
+    def height(self):
+        # Time Complexity: O(log_order n)
+        height = 1
+        node = self.root
+        while node.children:
+            node = node.children[0]
+            height += 1
+        return height
+
+    def _split_child(self, parent, index):
+        # Time Complexity: O(order)
+        t = self.min_degree
+        child = parent.children[index]
+        sibling = Node(child.keys[t:], child.children[t:])
+        parent.keys.insert(index, child.keys[t - 1])
+        parent.children.insert(index + 1, sibling)
+        del child.keys[t - 1 :]
+        del child.children[t:]
+
+    def _merge_children(self, parent, index):
+        # Time Complexity: O(order)
+        left = parent.children[index]
+        right = parent.children.pop(index + 1)
+        left.keys.append(parent.keys.pop(index))
+        left.keys.extend(right.keys)
+        left.children.extend(right.children)
+
+    def _borrow_from_left(self, parent, index):
+        # Time Complexity: O(order)
+        child, sibling = parent.children[index], parent.children[index - 1]
+        child.keys.insert(0, parent.keys[index - 1])
+        parent.keys[index - 1] = sibling.keys.pop()
+        if sibling.children:
+            child.children.insert(0, sibling.children.pop())
+
+    def _borrow_from_right(self, parent, index):
+        # Time Complexity: O(order)
+        child, sibling = parent.children[index], parent.children[index + 1]
+        child.keys.append(parent.keys[index])
+        parent.keys[index] = sibling.keys.pop(0)
+        if sibling.children:
+            child.children.append(sibling.children.pop(0))
+
+    def _min_key(self, node):
+        # Time Complexity: O(log_order n)
+        while node.children:
+            node = node.children[0]
+        return node.keys[0]
+
+    def _max_key(self, node):
+        # Time Complexity: O(log_order n)
+        while node.children:
+            node = node.children[-1]
+        return node.keys[-1]
+
+
+if __name__ == "__main__":
+    # Initialize a B-tree with a small order so it splits early
+    tree = BTree(order=4)
+    for key in [10, 20, 5, 6, 12, 30, 7, 17, 3, 1, 25, 15]:
+        tree.insert(key)
+
+    # Printing the B-tree
+    print("B-tree (in-order):", tree)
+    print("Number of keys:", len(tree))
+    print("Height of B-tree:", tree.height())
+
+    # Test search and __contains__
+    print("Search 12:", tree.search(12) is not None)
+    print("Is 13 in B-tree?", 13 in tree)
+
+    # Test range scans
+    print("Keys in range [6, 20]:", list(tree.iter_range(6, 20)))
+    print("Keys in range (6, 20):", list(tree.iter_range(6, 20, inclusive=False)))
+
+    # Test delete
+    tree.delete(6)
+    print("B-tree after deleting 6:", tree)
+    tree.delete(10)
+    print("B-tree after deleting 10:", tree)
+    try:
+        tree.delete(13)
+    except ValueError as e:
+        print("Deleting 13:", e)
+    for key in [1, 3, 5, 7, 12, 15, 17, 20, 25]:
+        tree.delete(key)
+    print("B-tree after deleting all but one key:", tree)
+    print("Height of B-tree:", tree.height())
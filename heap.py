@@ -1,9 +1,31 @@
+import asyncio
+import queue
+import threading
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for DaryHeap
+    np = None
+
+
 class MinHeap:
     def __init__(self):
         # Initialize an empty heap
         self.heap = []
         self.size = 0
 
+    @classmethod
+    def from_iterable(cls, items):
+        # Time Complexity: O(n)
+        # Builds bottom-up: sifting down every internal node from the last one
+        # costs O(n) in total, against O(n log n) for n inserts
+        heap = cls()
+        heap.heap = list(items)
+        heap.size = len(heap.heap)
+        heap._heapify_all()
+        return heap
+
     def __repr__(self):
         # Time Complexity: O(n)
         return " → ".join(map(str, self.heap))
@@ -32,7 +54,60 @@ class MinHeap:
         # Time Complexity: O(log n)
         if self.size == 0:
             raise IndexError("Heap is empty")
-        return self.delete(0)  # Remove and return the root element
+        # Move the last element to the root and sift it down; unlike delete,
+        # it can never need to move up
+        last = self.heap.pop()
+        self.size -= 1
+        if self.size == 0:
+            return last
+        smallest = self.heap[0]
+        self.heap[0] = last
+        self.sift_down(0)
+        return smallest
+
+    def push_many(self, items):
+        # Time Complexity: O(k log(n + k)), O(n + k) when k > n
+        # Inserts a batch of k items, rebuilding the whole heap when the batch
+        # outnumbers what is already there
+        items = list(items)
+        if len(items) > self.size:
+            self.heap.extend(items)
+            self.size += len(items)
+            self._heapify_all()
+            return
+        for data in items:
+            self.heap.append(data)
+            self.size += 1
+            self.sift_up(self.size - 1)
+
+    def pop_many(self, k):
+        # Time Complexity: O(k log n)
+        # Removes and returns the up to k smallest elements in ascending order
+        return [self.extract_min() for _ in range(min(k, self.size))]
+
+    def pushpop(self, data):
+        # Time Complexity: O(log n), O(1) when data is not larger than the minimum
+        # Inserts data, then removes and returns the smallest element
+        if self.size and self.heap[0] < data:
+            data, self.heap[0] = self.heap[0], data
+            self.sift_down(0)
+        return data
+
+    def replace(self, data):
+        # Time Complexity: O(log n)
+        # Removes and returns the smallest element, then inserts data
+        if self.size == 0:
+            raise IndexError("Heap is empty")
+        smallest = self.heap[0]
+        self.heap[0] = data
+        self.sift_down(0)
+        return smallest
+
+    def drain(self):
+        # Time Complexity: O(log n) per element
+        # Lazily removes and yields the elements in ascending order
+        while self.size:
+            yield self.extract_min()
 
     def is_empty(self):
         # Time Complexity: O(1)
@@ -40,23 +115,7 @@ class MinHeap:
 
     def heapify(self, index):
         # Time Complexity: O(log n)
-        left = self.left_child(index)
-        right = self.right_child(index)
-        smallest = index
-
-        # Find the smallest among root, left child, and right child
-        if left < self.size and self.heap[left] < self.heap[smallest]:
-            smallest = left
-        if right < self.size and self.heap[right] < self.heap[smallest]:
-            smallest = right
-
-        # If the smallest is not the current index, swap and recurse
-        if smallest != index:
-            self.heap[index], self.heap[smallest] = (
-                self.heap[smallest],
-                self.heap[index],
-            )
-            self.heapify(smallest)
+        self.sift_down(index)
 
     def parent(self, index):
         # Time Complexity: O(1)
@@ -71,28 +130,24 @@ class MinHeap:
         return 2 * index + 2
 
     def meld(self, other):
-        # Time Complexity: O(n log n)
+        # Time Complexity: O(n + m)
         self.heap.extend(other.heap)  # Merge the two heaps
         self.size += other.size
-        # Rebuild the min-heap property
-        for i in range(self.size // 2, -1, -1):
-            self.heapify(i)
+        self._heapify_all()  # Rebuild the min-heap property
 
     def delete(self, index):
         # Time Complexity: O(log n)
         if index < 0 or index >= self.size:
             raise IndexError("Index out of range")
 
-        # Swap the element to delete with the last element
-        self.heap[index], self.heap[self.size - 1] = (
-            self.heap[self.size - 1],
-            self.heap[index],
-        )
-        data = self.heap.pop()  # Remove the last element
+        # Fill the hole with the last element
+        data = self.heap[index]
+        last = self.heap.pop()
         self.size -= 1
 
         # Restore the min-heap property
         if index < self.size:
+            self.heap[index] = last
             self.sift_down(index)
             self.sift_up(index)
 
@@ -100,31 +155,737 @@ class MinHeap:
 
     def sift_up(self, index):
         # Time Complexity: O(log n)
-        parent = self.parent(index)
-        # Swap with parent if the current element is smaller
-        if parent is not None and self.heap[index] < self.heap[parent]:
-            self.heap[index], self.heap[parent] = self.heap[parent], self.heap[index]
-            self.sift_up(parent)
+        # Moves larger parents down into the hole and writes the element once
+        heap = self.heap
+        data = heap[index]
+        while index > 0:
+            parent = (index - 1) // 2
+            if not data < heap[parent]:
+                break
+            heap[index] = heap[parent]
+            index = parent
+        heap[index] = data
 
     def sift_down(self, index):
         # Time Complexity: O(log n)
-        left = self.left_child(index)
-        right = self.right_child(index)
-        smallest = index
+        heap = self.heap
+        size = self.size
+        data = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            # Pick the smaller child
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < data:
+                break
+            heap[index] = heap[child]
+            index = child
+        heap[index] = data
+
+    def _heapify_all(self):
+        # Time Complexity: O(n)
+        for i in range(self.size // 2 - 1, -1, -1):
+            self.sift_down(i)
+
+
+class IndexedMinHeap(MinHeap):
+    # Min-heap of distinct items ordered by a separate priority; a map from
+    # item to array position, kept in sync by every move, makes items
+    # addressable, so they can be found, re-prioritized and removed
+    def __init__(self):
+        super().__init__()
+        self.position = {}  # item -> index in self.heap
+        self.priority = {}  # item -> priority
+
+    @classmethod
+    def from_iterable(cls, pairs):
+        # Time Complexity: O(n)
+        # Builds from (item, priority) pairs
+        heap = cls()
+        for item, priority in pairs:
+            if item in heap.priority:
+                raise ValueError("Item already in heap")
+            heap.position[item] = len(heap.heap)
+            heap.priority[item] = priority
+            heap.heap.append(item)
+        heap.size = len(heap.heap)
+        heap._heapify_all()
+        return heap
+
+    def __repr__(self):
+        # Time Complexity: O(n)
+        return " → ".join(f"{item}: {self.priority[item]}" for item in self.heap)
+
+    def __contains__(self, item):
+        # Time Complexity: O(1)
+        return item in self.position
+
+    def insert(self, item, priority):
+        # Time Complexity: O(log n)
+        if item in self.position:
+            raise ValueError("Item already in heap")
+        self.heap.append(item)
+        self.position[item] = self.size
+        self.priority[item] = priority
+        self.size += 1
+        self.sift_up(self.size - 1)
 
-        # Find the smallest among root, left child, and right child
-        if left < self.size and self.heap[left] < self.heap[smallest]:
-            smallest = left
-        if right < self.size and self.heap[right] < self.heap[smallest]:
-            smallest = right
+    def push_many(self, pairs):
+        # Time Complexity: O(k log(n + k))
+        for item, priority in pairs:
+            self.insert(item, priority)
 
-        # If the smallest is not the current index, swap and recurse
-        if smallest != index:
-            self.heap[index], self.heap[smallest] = (
-                self.heap[smallest],
-                self.heap[index],
-            )
-            self.sift_down(smallest)
+    def pushpop(self, item, priority):
+        # Time Complexity: O(log n)
+        # Inserts item, then removes and returns the (item, priority) pair with
+        # the smallest priority
+        if item in self.position:
+            raise ValueError("Item already in heap")
+        if self.size and self.priority[self.heap[0]] < priority:
+            return self.replace(item, priority)
+        return item, priority
+
+    def replace(self, item, priority):
+        # Time Complexity: O(log n)
+        # Removes and returns the smallest (item, priority) pair, then inserts item
+        if self.size == 0:
+            raise IndexError("Heap is empty")
+        if item in self.position:
+            raise ValueError("Item already in heap")
+        smallest = self.heap[0]
+        del self.position[smallest]
+        smallest_priority = self.priority.pop(smallest)
+        self.heap[0] = item
+        self.priority[item] = priority
+        self.sift_down(0)
+        return smallest, smallest_priority
+
+    def peek(self):
+        # Time Complexity: O(1)
+        # Returns the (item, priority) pair with the smallest priority
+        if self.size == 0:
+            raise IndexError("Heap is empty")
+        item = self.heap[0]
+        return item, self.priority[item]
+
+    def extract_min(self):
+        # Time Complexity: O(log n)
+        # Removes and returns the (item, priority) pair with the smallest priority
+        if self.size == 0:
+            raise IndexError("Heap is empty")
+        return self.delete(0)
+
+    def decrease_key(self, item, priority):
+        # Time Complexity: O(log n)
+        if item not in self.position:
+            raise KeyError(item)
+        if self.priority[item] < priority:
+            raise ValueError("New priority is greater than the current one")
+        self.priority[item] = priority
+        self.sift_up(self.position[item])
+
+    def increase_key(self, item, priority):
+        # Time Complexity: O(log n)
+        if item not in self.position:
+            raise KeyError(item)
+        if priority < self.priority[item]:
+            raise ValueError("New priority is less than the current one")
+        self.priority[item] = priority
+        self.sift_down(self.position[item])
+
+    def remove(self, item):
+        # Time Complexity: O(log n)
+        # Returns the priority the item had
+        if item not in self.position:
+            raise KeyError(item)
+        return self.delete(self.position[item])[1]
+
+    def meld(self, other):
+        # Time Complexity: O(n + m)
+        if not self.position.keys().isdisjoint(other.position):
+            raise ValueError("Heaps share items")
+        self.heap.extend(other.heap)
+        self.priority.update(other.priority)
+        for index in range(self.size, self.size + other.size):
+            self.position[self.heap[index]] = index
+        self.size += other.size
+        self._heapify_all()
+
+    def delete(self, index):
+        # Time Complexity: O(log n)
+        # Returns the removed (item, priority) pair
+        if index < 0 or index >= self.size:
+            raise IndexError("Index out of range")
+        item = self.heap[index]
+        last = self.heap.pop()
+        self.size -= 1
+        del self.position[item]
+        priority = self.priority.pop(item)
+        if index < self.size:
+            # Refill the hole with the last item, which may need to move either way
+            self.heap[index] = last
+            self.position[last] = index
+            self.sift_down(index)
+            self.sift_up(self.position[last])
+        return item, priority
+
+    def sift_up(self, index):
+        # Time Complexity: O(log n)
+        # Moves parents down into the hole and drops the item in once, so each
+        # level costs one write to the heap and one to the position map
+        heap, position, priority = self.heap, self.position, self.priority
+        item = heap[index]
+        key = priority[item]
+        while index > 0:
+            parent = (index - 1) // 2
+            parent_item = heap[parent]
+            if not key < priority[parent_item]:
+                break
+            heap[index] = parent_item
+            position[parent_item] = index
+            index = parent
+        heap[index] = item
+        position[item] = index
+
+    def sift_down(self, index):
+        # Time Complexity: O(log n)
+        heap, position, priority = self.heap, self.position, self.priority
+        size = self.size
+        item = heap[index]
+        key = priority[item]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            # Pick the smaller child
+            if child + 1 < size and priority[heap[child + 1]] < priority[heap[child]]:
+                child += 1
+            child_item = heap[child]
+            if not priority[child_item] < key:
+                break
+            heap[index] = child_item
+            position[child_item] = index
+            index = child
+        heap[index] = item
+        position[item] = index
+
+
+class PairingNode:
+    __slots__ = ("data", "child", "sibling")
+
+    def __init__(self, data):
+        self.data = data
+        self.child = None  # Leftmost child
+        self.sibling = None  # Next sibling to the right
+
+
+class PairingHeap:
+    # Heap-ordered multiway tree stored as leftmost-child/right-sibling links;
+    # insert and meld just link two roots, and extract_min pays for the
+    # deferred work by pairing up the root's children
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def __repr__(self):
+        # Time Complexity: O(n)
+        return " → ".join(map(str, self._items()))
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        return self.size
+
+    def is_empty(self):
+        # Time Complexity: O(1)
+        return self.size == 0
+
+    def insert(self, data):
+        # Time Complexity: O(1)
+        self.root = self._link(self.root, PairingNode(data))
+        self.size += 1
+
+    def peek(self):
+        # Time Complexity: O(1)
+        if self.root is None:
+            raise IndexError("Heap is empty")
+        return self.root.data
+
+    def extract_min(self):
+        # Time Complexity: O(log n) amortized
+        if self.root is None:
+            raise IndexError("Heap is empty")
+        data = self.root.data
+        self.root = self._merge_pairs(self.root.child)
+        self.size -= 1
+        return data
+
+    def meld(self, other):
+        # Time Complexity: O(1)
+        # Takes over the nodes of other, which is left empty
+        self.root = self._link(self.root, other.root)
+        self.size += other.size
+        other.root = None
+        other.size = 0
+
+    def _link(self, a, b):
+        # Time Complexity: O(1)
+        # The larger root becomes the leftmost child of the smaller one
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.data < a.data:
+            a, b = b, a
+        b.sibling = a.child
+        a.child = b
+        return a
+
+    def _merge_pairs(self, node):
+        # Time Complexity: O(k) for k siblings
+        # Links siblings in pairs left to right, then folds the pairs together
+        # right to left
+        pairs = []
+        while node is not None:
+            first, node = node, node.sibling
+            first.sibling = None
+            if node is None:
+                pairs.append(first)
+                break
+            second, node = node, node.sibling
+            second.sibling = None
+            pairs.append(self._link(first, second))
+        root = None
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        return root
+
+    def _items(self):
+        # Time Complexity: O(n)
+        # Preorder walk: the root first, then each subtree left to right
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node.data
+            if node.sibling is not None:
+                stack.append(node.sibling)
+            if node.child is not None:
+                stack.append(node.child)
+
+
+class LeftistNode:
+    __slots__ = ("data", "left", "right", "rank")
+
+    def __init__(self, data):
+        self.data = data
+        self.left = None
+        self.right = None
+        self.rank = 1  # Length of the right spine, 0 for an empty tree
+
+
+class LeftistHeap:
+    # Heap-ordered binary tree whose right spine is the shortest path to a
+    # missing child, so it has at most log(n + 1) nodes; meld walks only the
+    # two right spines
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def __repr__(self):
+        # Time Complexity: O(n)
+        return " → ".join(map(str, self._items()))
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        return self.size
+
+    def is_empty(self):
+        # Time Complexity: O(1)
+        return self.size == 0
+
+    def insert(self, data):
+        # Time Complexity: O(log n)
+        self.root = self._merge(self.root, LeftistNode(data))
+        self.size += 1
+
+    def peek(self):
+        # Time Complexity: O(1)
+        if self.root is None:
+            raise IndexError("Heap is empty")
+        return self.root.data
+
+    def extract_min(self):
+        # Time Complexity: O(log n)
+        if self.root is None:
+            raise IndexError("Heap is empty")
+        data = self.root.data
+        self.root = self._merge(self.root.left, self.root.right)
+        self.size -= 1
+        return data
+
+    def meld(self, other):
+        # Time Complexity: O(log n + log m)
+        # Takes over the nodes of other, which is left empty
+        self.root = self._merge(self.root, other.root)
+        self.size += other.size
+        other.root = None
+        other.size = 0
+
+    def _merge(self, a, b):
+        # Time Complexity: O(log n + log m)
+        # Merges the right spines top-down, then walks back up swapping
+        # children wherever the right side became the deeper one
+        spine = []
+        while a is not None and b is not None:
+            if b.data < a.data:
+                a, b = b, a
+            spine.append(a)
+            a = a.right
+        node = a if a is not None else b
+        while spine:
+            parent = spine.pop()
+            parent.right = node
+            left_rank = parent.left.rank if parent.left is not None else 0
+            if left_rank < node.rank:
+                parent.left, parent.right = node, parent.left
+            parent.rank = (parent.right.rank if parent.right is not None else 0) + 1
+            node = parent
+        return node
+
+    def _items(self):
+        # Time Complexity: O(n)
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node.data
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+
+class DaryHeap:
+    # Min-heap of numeric priorities with int64 payloads held in two parallel
+    # typed arrays instead of a list of boxed objects; d children per node
+    # make the tree log_d n deep, and the children of a node sit side by side
+    def __init__(self, d=4, dtype="float64"):
+        if np is None:
+            raise ImportError("DaryHeap requires NumPy")
+        if d < 2:
+            raise ValueError("d must be at least 2")
+        self.d = d
+        self.dtype = np.dtype(dtype)
+        self.priorities = array(self.dtype.char)  # Grows in place, amortized O(1)
+        self.payloads = array("q")  # payloads[i] belongs to priorities[i]
+        self.size = 0
+
+    @classmethod
+    def from_arrays(cls, priorities, payloads=None, d=4, dtype="float64"):
+        # Time Complexity: O(n), vectorized per tree level
+        # payloads defaults to 0..n-1, the positions in priorities
+        heap = cls(d, dtype)
+        priorities = np.ascontiguousarray(priorities, dtype=heap.dtype)
+        if payloads is None:
+            payloads = np.arange(len(priorities), dtype=np.int64)
+        payloads = np.ascontiguousarray(payloads, dtype=np.int64)
+        if payloads.shape != priorities.shape:
+            raise ValueError("priorities and payloads must have the same length")
+        heap.priorities.frombytes(priorities.tobytes())
+        heap.payloads.frombytes(payloads.tobytes())
+        heap.size = len(priorities)
+        heap._heapify_all()
+        return heap
+
+    def __repr__(self):
+        # Time Complexity: O(n)
+        pairs = zip(self.payloads, self.priorities)
+        return " → ".join(f"{payload}: {priority}" for payload, priority in pairs)
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        return self.size
+
+    def is_empty(self):
+        # Time Complexity: O(1)
+        return self.size == 0
+
+    def insert(self, payload, priority):
+        # Time Complexity: O(log_d n)
+        self.priorities.append(priority)
+        self.payloads.append(payload)
+        self.size += 1
+        self.sift_up(self.size - 1)
+
+    def push_many(self, payloads, priorities):
+        # Time Complexity: O(k log_d(n + k)), O(n + k) when k > n
+        priorities = np.ascontiguousarray(priorities, dtype=self.dtype)
+        payloads = np.ascontiguousarray(payloads, dtype=np.int64)
+        if payloads.shape != priorities.shape:
+            raise ValueError("priorities and payloads must have the same length")
+        if len(priorities) > self.size:
+            self.priorities.frombytes(priorities.tobytes())
+            self.payloads.frombytes(payloads.tobytes())
+            self.size += len(priorities)
+            self._heapify_all()
+            return
+        for payload, priority in zip(payloads.tolist(), priorities.tolist()):
+            self.insert(payload, priority)
+
+    def peek(self):
+        # Time Complexity: O(1)
+        # Returns the (payload, priority) pair with the smallest priority
+        if self.size == 0:
+            raise IndexError("Heap is empty")
+        return self.payloads[0], self.priorities[0]
+
+    def extract_min(self):
+        # Time Complexity: O(d log_d n)
+        if self.size == 0:
+            raise IndexError("Heap is empty")
+        priority = self.priorities.pop()
+        payload = self.payloads.pop()
+        self.size -= 1
+        if self.size == 0:
+            return payload, priority
+        smallest = self.payloads[0], self.priorities[0]
+        self.priorities[0] = priority
+        self.payloads[0] = payload
+        self.sift_down(0)
+        return smallest
+
+    def sift_up(self, index):
+        # Time Complexity: O(log_d n)
+        priorities, payloads, d = self.priorities, self.payloads, self.d
+        priority, payload = priorities[index], payloads[index]
+        while index > 0:
+            parent = (index - 1) // d
+            if not priority < priorities[parent]:
+                break
+            priorities[index] = priorities[parent]
+            payloads[index] = payloads[parent]
+            index = parent
+        priorities[index] = priority
+        payloads[index] = payload
+
+    def sift_down(self, index):
+        # Time Complexity: O(d log_d n)
+        priorities, payloads, d = self.priorities, self.payloads, self.d
+        size = self.size
+        priority, payload = priorities[index], payloads[index]
+        while True:
+            first = d * index + 1
+            if first >= size:
+                break
+            # Pick the smallest of up to d adjacent children with C-level scans
+            block = priorities[first : first + d]
+            smallest = min(block)
+            if not smallest < priority:
+                break
+            child = first + block.index(smallest)
+            priorities[index] = smallest
+            payloads[index] = payloads[child]
+            index = child
+        priorities[index] = priority
+        payloads[index] = payload
+
+    def _heapify_all(self):
+        # Time Complexity: O(n)
+        # Floyd's bottom-up build, one tree level at a time: the nodes of a
+        # level root disjoint subtrees, so all of them sift down together as
+        # one batch of array operations per step
+        n, d = self.size, self.d
+        if n < 2:
+            return
+        # Writable views sharing memory with the arrays; dropped before the
+        # arrays may need to resize again
+        priorities = np.frombuffer(self.priorities, dtype=self.dtype)
+        payloads = np.frombuffer(self.payloads, dtype=np.int64)
+        if self.dtype.kind == "f":
+            sentinel = np.inf
+        else:
+            sentinel = np.iinfo(self.dtype).max
+        offsets = np.arange(1, d + 1)
+        # Level boundaries: level k starts at (d^k - 1) / (d - 1)
+        starts = [0]
+        while starts[-1] < n:
+            starts.append(starts[-1] * d + 1)
+        last_parent = (n - 2) // d
+        for level in range(len(starts) - 2, -1, -1):
+            lo, hi = starts[level], min(starts[level + 1], last_parent + 1)
+            if lo >= hi:
+                continue
+            nodes = np.arange(lo, hi)
+            while len(nodes):
+                children = nodes[:, None] * d + offsets
+                valid = children < n
+                children = np.minimum(children, n - 1)
+                child_priorities = np.where(valid, priorities[children], sentinel)
+                best = np.argmin(child_priorities, axis=1)
+                rows = np.arange(len(nodes))
+                best_children = children[rows, best]
+                swap = child_priorities[rows, best] < priorities[nodes]
+                nodes, best_children = nodes[swap], best_children[swap]
+                # Fancy indexing copies, so each swap reads before it writes
+                priorities[nodes], priorities[best_children] = (
+                    priorities[best_children],
+                    priorities[nodes],
+                )
+                payloads[nodes], payloads[best_children] = (
+                    payloads[best_children],
+                    payloads[nodes],
+                )
+                nodes = best_children[best_children <= last_parent]
+        del priorities, payloads
+
+
+class _Reversed:
+    # Inverts the ordering of a key so that a min-heap keeps the k smallest
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class TopK:
+    # Streaming collector of the k largest (or, with largest=False, smallest)
+    # items by key, in O(k) memory: a size-k MinHeap holds the kept items with
+    # the weakest on top, so a new item either replaces it or is rejected
+    # after one comparison; ties keep the item seen first
+    def __init__(self, k, key=None, largest=True):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.key = key
+        self.largest = largest
+        self.heap = MinHeap()  # Entries are (key, -sequence number, item)
+        self.seen = 0
+
+    def __repr__(self):
+        # Time Complexity: O(k log k)
+        return " → ".join(map(str, self.result()))
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        return self.heap.size
+
+    def add(self, item):
+        # Time Complexity: O(1) if rejected, O(log k) if kept
+        # Returns whether the item is (for now) among the top k
+        key = item if self.key is None else self.key(item)
+        return self._offer(key, item)
+
+    def add_many(self, items):
+        # Time Complexity: O(n log k), O(n) for the rejected items
+        key_of, heap, k, largest = self.key, self.heap, self.k, self.largest
+        entries = heap.heap
+        seen = self.seen
+        for item in items:
+            key = item if key_of is None else key_of(item)
+            seen += 1
+            if heap.size < k:
+                heap.insert((key if largest else _Reversed(key), -seen, item))
+            elif largest:
+                if entries[0][0] < key:
+                    heap.replace((key, -seen, item))
+            elif key < entries[0][0].key:
+                heap.replace((_Reversed(key), -seen, item))
+        self.seen = seen
+
+    def merge(self, other):
+        # Time Complexity: O(k log k)
+        # Folds in another collector's items, e.g. one per worker
+        if other.k != self.k or other.largest != self.largest:
+            raise ValueError("Collectors must have the same k and direction")
+        # Best first, so that ties within other keep their original order
+        for key, _, item in sorted(other.heap.heap, reverse=True):
+            self._offer(key if self.largest else key.key, item)
+
+    def result(self):
+        # Time Complexity: O(k log k)
+        # Returns the kept items, best first
+        return [item for _, _, item in sorted(self.heap.heap, reverse=True)]
+
+    def _offer(self, key, item):
+        # Time Complexity: O(1) if rejected, O(log k) if kept
+        self.seen += 1
+        heap = self.heap
+        if heap.size == self.k:
+            top = heap.heap[0][0]
+            if not (top < key if self.largest else key < top.key):
+                return False
+        entry = (key if self.largest else _Reversed(key), -self.seen, item)
+        if heap.size < self.k:
+            heap.insert(entry)
+        else:
+            heap.replace(entry)
+        return True
+
+
+class BlockingPriorityQueue(queue.Queue):
+    # Thread-safe priority queue over a MinHeap: queue.Queue supplies the lock
+    # and the not_empty/not_full conditions behind put/get(timeout) and the
+    # maxsize backpressure, and calls the hooks below with the lock held
+    def get_many(self, n, timeout=None):
+        # Time Complexity: O(k log n) for the k <= n items returned
+        # Waits like get for the first item, then takes up to n items, smallest
+        # first, under a single acquisition of the lock
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        if timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        with self.not_empty:
+            if timeout is None:
+                while not self.queue.size:
+                    self.not_empty.wait()
+            elif not self.not_empty.wait_for(self._qsize, timeout):
+                raise queue.Empty
+            items = self.queue.pop_many(n)
+            self.not_full.notify(len(items))
+            return items
+
+    def _init(self, maxsize):
+        self.queue = MinHeap()
+
+    def _qsize(self):
+        return self.queue.size
+
+    def _put(self, data):
+        self.queue.insert(data)
+
+    def _get(self):
+        return self.queue.extract_min()
+
+
+class AsyncPriorityQueue(asyncio.Queue):
+    # Priority queue over a MinHeap for the coroutines of one event loop, with
+    # awaitable put/get and maxsize backpressure from asyncio.Queue, which
+    # reads the heap through len(self._queue)
+    async def get_many(self, n):
+        # Time Complexity: O(k log n) for the k <= n items returned
+        # Waits like get for the first item, then takes whatever else is ready,
+        # up to n items, without yielding to the event loop
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        items = [await self.get()]
+        while len(items) < n and self._queue.size:
+            items.append(self.get_nowait())
+        return items
+
+    def _init(self, maxsize):
+        self._queue = MinHeap()
+
+    def _put(self, data):
+        self._queue.insert(data)
+
+    def _get(self):
+        return self._queue.extract_min()
 
 
 if __name__ == "__main__":
@@ -174,3 +935,87 @@ if __name__ == "__main__":
     # Final heap state
     print("Is heap empty after extracting all elements?", h.is_empty())
     print("Final heap state:", h)
+
+    # Test the indexed heap with priority updates
+    ih = IndexedMinHeap()
+    for item, priority in [("a", 5), ("b", 3), ("c", 8), ("d", 1), ("e", 4)]:
+        ih.insert(item, priority)
+    print("Indexed heap:", ih)
+    print("Is 'c' in the indexed heap?", "c" in ih)
+    ih.decrease_key("c", 0)
+    print("Peek after decreasing 'c' to 0:", ih.peek())
+    ih.increase_key("d", 9)
+    print("Indexed heap after increasing 'd' to 9:", ih)
+    print("Removed 'b' with priority:", ih.remove("b"))
+    while not ih.is_empty():
+        print("Extracted min:", ih.extract_min())
+
+    # Test the mergeable heaps
+    for heap_class in (PairingHeap, LeftistHeap):
+        first, second = heap_class(), heap_class()
+        for data in [5, 3, 8]:
+            first.insert(data)
+        for data in [7, 1, 4]:
+            second.insert(data)
+        first.meld(second)
+        print(f"{heap_class.__name__} after meld:", first, "| size:", len(first))
+        print("Extracted in order:", [first.extract_min() for _ in range(len(first))])
+
+    # Test bulk construction and batched operations
+    bulk = MinHeap.from_iterable([9, 4, 7, 1, 8, 2])
+    print("Heap built from iterable:", bulk)
+    bulk.push_many([6, 3, 5])
+    print("Heap after push_many:", bulk)
+    print("pop_many(3):", bulk.pop_many(3))
+    print("pushpop(0):", bulk.pushpop(0))
+    print("replace(10):", bulk.replace(10))
+    print("Drained in order:", list(bulk.drain()))
+
+    # Test the NumPy-backed d-ary heap
+    if np is not None:
+        dary = DaryHeap.from_arrays([4.5, 1.0, 3.25, 9.0, 0.5], d=3)
+        dary.insert(10, 2.0)
+        print("DaryHeap:", dary)
+        print("Peek (payload, priority):", dary.peek())
+        print("Extracted in order:", [dary.extract_min() for _ in range(len(dary))])
+
+    # Test the bounded top-k collector
+    scores = [("a", 7), ("b", 3), ("c", 9), ("d", 7), ("e", 1), ("f", 8)]
+    top = TopK(3, key=lambda pair: pair[1])
+    top.add_many(scores[:4])
+    other = TopK(3, key=lambda pair: pair[1])
+    other.add_many(scores[4:])
+    top.merge(other)
+    print("Top 3 by score:", top.result())
+    bottom = TopK(2, key=lambda pair: pair[1], largest=False)
+    bottom.add_many(scores)
+    print("Bottom 2 by score:", bottom.result())
+
+    # Test the blocking queue with backpressure and a consumer thread
+    jobs = BlockingPriorityQueue(maxsize=3)
+    for job in [5, 1, 4]:
+        jobs.put(job)
+    try:
+        jobs.put(2, timeout=0.01)
+    except queue.Full:
+        print("Blocking queue is full")
+    print("Blocking queue got:", jobs.get(), jobs.get_many(5))
+    consumer = threading.Thread(
+        target=lambda: print("Consumer thread got:", jobs.get())
+    )
+    consumer.start()  # Waits until the next put
+    jobs.put(7)
+    consumer.join()
+    try:
+        jobs.get(timeout=0.01)
+    except queue.Empty:
+        print("Blocking queue is empty")
+
+    # Test the asyncio queue
+    async def async_demo():
+        tasks = AsyncPriorityQueue()
+        for task in [3, 1, 2]:
+            await tasks.put(task)
+        print("Async queue got:", await tasks.get(), await tasks.get_many(5))
+
+    asyncio.run(async_demo())
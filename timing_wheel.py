@@ -0,0 +1,203 @@
+from math import ceil, floor
+
+from heap import MinHeap
+
+
+class Timer:
+    __slots__ = ("deadline", "tick", "item", "bucket")
+
+    def __init__(self, deadline, tick, item):
+        self.deadline = deadline
+        self.tick = tick  # First tick at or after the deadline
+        self.item = item
+        self.bucket = None  # Wheel slot or overflow heap, None once fired or cancelled
+
+
+class TimingWheel:
+    # Hierarchical timing wheel: level l has `slots` buckets of slots**l ticks
+    # each, and a timer sits at the lowest level whose bucket span separates it
+    # from the current tick. Buckets are dicts, so schedule and cancel are
+    # O(1); when the clock crosses a bucket boundary of level l, that level's
+    # next bucket is re-placed into the finer levels below. Deadlines past the
+    # top level wait in a MinHeap and move into the wheel when they come in
+    # range; cancelled overflow entries are dropped lazily.
+    def __init__(self, resolution=1.0, slots=256, levels=4, start=0):
+        # resolution: time units per tick; deadlines fire on the first tick at
+        # or after them, so never early and at most one tick late
+        if slots < 2 or levels < 1:
+            raise ValueError("slots must be at least 2 and levels at least 1")
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.spans = [slots**level for level in range(levels + 1)]  # Ticks per bucket
+        self.wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self.current = floor(start / resolution)  # Last tick processed
+        self.due = {}  # At or before the current tick, fired by the next advance
+        self.overflow = MinHeap()  # (tick, sequence number, timer) beyond the top level
+        self.cancelled_overflow = 0
+        self.sequence = 0
+        self.in_wheel = 0
+        self.size = 0
+
+    def __repr__(self):
+        # Time Complexity: O(n log n)
+        timers = [timer for bucket in self._buckets() for timer in bucket]
+        timers += [
+            timer for _, _, timer in self.overflow.heap if timer.bucket is self.overflow
+        ]
+        timers.sort(key=lambda timer: timer.tick)
+        return " → ".join(f"{timer.item}: {timer.deadline}" for timer in timers)
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        # Number of pending timers
+        return self.size
+
+    def schedule(self, deadline, item):
+        # Time Complexity: O(1), O(log n) for deadlines past the top level
+        # Returns a handle for cancel
+        timer = Timer(deadline, ceil(deadline / self.resolution), item)
+        self.size += 1
+        if timer.tick <= self.current:
+            timer.bucket = self.due
+            self.due[timer] = None
+        else:
+            self._place(timer)
+        return timer
+
+    def cancel(self, timer):
+        # Time Complexity: O(1)
+        # Returns whether the timer was still pending
+        bucket = timer.bucket
+        if bucket is None:
+            return False
+        timer.bucket = None
+        self.size -= 1
+        if bucket is self.overflow:
+            # Left in the heap; rebuild once dead entries are the majority
+            self.cancelled_overflow += 1
+            if 2 * self.cancelled_overflow > self.overflow.size:
+                self._compact_overflow()
+            return True
+        del bucket[timer]
+        if bucket is not self.due:
+            self.in_wheel -= 1
+        return True
+
+    def advance(self, now):
+        # Time Complexity: O(1) amortized per elapsed tick and per timer
+        # Moves the clock to now and returns the items of every timer that
+        # expired, in tick order
+        target = floor(now / self.resolution)
+        # Timers scheduled in the past fire first, oldest tick first
+        expired = self._fire(sorted(self.due, key=lambda timer: timer.tick))
+        self.due = {}
+        wheels, spans, slots = self.wheels, self.spans, self.slots
+        top_span = spans[-1]
+        while self.current < target:
+            if not self.in_wheel:
+                # Nothing to cascade or fire before the overflow heap next
+                # comes in range, so jump straight to that boundary
+                if self.overflow.size == self.cancelled_overflow:
+                    self.current = target
+                    break
+                boundary = (self.current // top_span + 1) * top_span
+                if target < boundary:
+                    self.current = target
+                    break
+                self.current = boundary - 1
+            tick = self.current = self.current + 1
+            if tick % slots == 0:
+                if tick % top_span == 0:
+                    self._pull_overflow(tick)
+                # Re-place the buckets whose span starts now, coarsest first
+                level = 1
+                while level < self.levels and tick % spans[level + 1] == 0:
+                    level += 1
+                for level in range(min(level, self.levels - 1), 0, -1):
+                    index = tick // spans[level] % slots
+                    bucket = wheels[level][index]
+                    if bucket:
+                        wheels[level][index] = {}
+                        self.in_wheel -= len(bucket)
+                        for timer in bucket:
+                            self._place(timer)
+            index = tick % slots
+            bucket = wheels[0][index]
+            if bucket:
+                wheels[0][index] = {}
+                self.in_wheel -= len(bucket)
+                expired += self._fire(bucket)
+        return expired
+
+    def _place(self, timer):
+        # Time Complexity: O(levels)
+        # Files a timer due at or after the current tick into the lowest level
+        # whose buckets tell it apart from the current tick
+        tick, current, spans = timer.tick, self.current, self.spans
+        for level in range(self.levels):
+            if tick // spans[level + 1] == current // spans[level + 1]:
+                bucket = self.wheels[level][tick // spans[level] % self.slots]
+                bucket[timer] = None
+                timer.bucket = bucket
+                self.in_wheel += 1
+                return
+        self.sequence += 1
+        timer.bucket = self.overflow
+        self.overflow.insert((tick, self.sequence, timer))
+
+    def _pull_overflow(self, tick):
+        # Time Complexity: O(k log n) for k timers moved
+        # Moves overflow timers that now fall within the top level's range
+        overflow, limit = self.overflow, tick + self.spans[-1]
+        while overflow.size and overflow.peek()[0] < limit:
+            timer = overflow.extract_min()[2]
+            if timer.bucket is overflow:
+                self._place(timer)
+            else:
+                self.cancelled_overflow -= 1
+
+    def _compact_overflow(self):
+        # Time Complexity: O(n)
+        live = [
+            entry for entry in self.overflow.heap if entry[2].bucket is self.overflow
+        ]
+        self.overflow = MinHeap.from_iterable(live)
+        for _, _, timer in live:
+            timer.bucket = self.overflow
+        self.cancelled_overflow = 0
+
+    def _fire(self, bucket):
+        # Time Complexity: O(k)
+        for timer in bucket:
+            timer.bucket = None
+        self.size -= len(bucket)
+        return [timer.item for timer in bucket]
+
+    def _buckets(self):
+        yield self.due
+        for wheel in self.wheels:
+            yield from wheel
+
+
+if __name__ == "__main__":
+    # Initialize a small wheel: 4 slots per level, 2 levels, then overflow
+    wheel = TimingWheel(resolution=1, slots=4, levels=2)
+    timers = {}
+    deadlines = [("a", 3), ("b", 5), ("c", 2.5), ("d", 14), ("e", 40), ("f", 9)]
+    for name, deadline in deadlines:
+        timers[name] = wheel.schedule(deadline, name)
+    print("Pending timers:", wheel)
+    print("Number of pending timers:", len(wheel))
+
+    # Test cancel
+    print("Cancel 'b':", wheel.cancel(timers["b"]))
+    print("Cancel 'b' again:", wheel.cancel(timers["b"]))
+
+    # Test advance
+    print("Expired by 3:", wheel.advance(3))
+    print("Expired by 10:", wheel.advance(10))
+    print("Cancel 'e' from the overflow heap:", wheel.cancel(timers["e"]))
+    wheel.schedule(12, "g")
+    print("Expired by 100:", wheel.advance(100))
+    print("Number of pending timers:", len(wheel))
@@ -1,71 +1,773 @@
+import codecs
+import gc
+import heapq
+import mmap
+from array import array
+from bisect import insort
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import groupby, islice
+
+# Frozen trie file layout, a flat array of native-endian uint32 words:
+#   header: magic, version, node count, edge count, word count
+#   nodes:  (first edge, edge count | END_FLAG) per node, root first
+#   edges:  (character code point, child node) per edge, sorted per node
+FROZEN_MAGIC = 0x45495254
+FROZEN_VERSION = 1
+HEADER_WORDS = 5
+END_FLAG = 1 << 31
+
+
+@contextmanager
+def _gc_paused():
+    # Bulk builds only allocate, so skip the cyclic collector's repeated scans
+    # of the growing node graph
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class Node:
+    __slots__ = ("children", "is_end", "weight", "top", "count", "value")
+
     def __init__(self):
-        self.children = {}  # Dictionary to store child nodes
+        self.children = None  # Dictionary of child nodes, created on first insert
         self.is_end = False  # Indicates if this node is the end of a word
+        self.weight = 0  # Ranking weight of the word ending here
+        self.top = None  # Ranked (-weight, word) completions, see Trie._cached
+        self.count = 0  # Number of words ending at or below this node
+        self.value = None  # Payload stored with the word ending here
 
 
 class Trie:
-    def __init__(self):
+    def __init__(self, cache_size=10):
+        # cache_size: completions cached per node, complete() with k up to this
+        # size never walks a subtree
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
         self.root = Node()
+        self.cache_size = cache_size
+
+    @classmethod
+    def from_sorted(cls, iterable, cache_size=10):
+        # Time Complexity: O(L + n · c) for L input characters, c = cache_size
+        # Builds the trie in one pass from words in sorted order: each word only
+        # adds the nodes past its common prefix with the previous word, and a
+        # node's count is final once the input moves past it
+        trie = cls(cache_size=cache_size)
+        with _gc_paused():
+            trie._extend_sorted(iterable)
+        return trie
+
+    @classmethod
+    def build_parallel(cls, path, workers=None, cache_size=10):
+        # Time Complexity: O((L + n · c) / workers) plus transfer of the shards
+        # Builds from a file of sorted words, one per line, by handing each
+        # first-character shard to a process pool and attaching the returned
+        # subtries under a fresh root; workers=1 builds in this process instead
+        with open(path, encoding="utf-8") as f:
+            words = [line.rstrip("\n") for line in f]
+        shards = []
+        for _, group in groupby(filter(None, words), key=lambda word: word[0]):
+            group = list(group)
+            if shards and group[0] < shards[-1][0][-1]:
+                raise ValueError("Input must be sorted")
+            shards.append((group, cache_size))
+        if workers == 1:
+            words = (word for group, _ in shards for word in group)
+            return cls.from_sorted(words, cache_size=cache_size)
+        trie = cls(cache_size=cache_size)
+        with ProcessPoolExecutor(max_workers=workers) as pool, _gc_paused():
+            trie._graft(pool.map(_build_shard, shards))
+        trie._rerank(trie.root, "")
+        return trie
 
     def __repr__(self):
         # Time Complexity: O(n), where n is the total number of characters in all words
-        def _repr(node, path):
-            if node.is_end:
-                res.append("".join(path))  # Append the current word to the result
-            for char, child_node in node.children.items():
-                _repr(child_node, path + [char])  # Traverse all children recursively
+        return "\n".join(self.keys())
 
-        res = []
-        _repr(self.root, [])
-        return "\n".join(res)
+    def __iter__(self):
+        # Time Complexity: O(n)
+        return self.keys()
 
-    def insert(self, word):
+    def __len__(self):
+        # Time Complexity: O(1)
+        return self.root.count
+
+    def __contains__(self, word):
         # Time Complexity: O(m), where m is the length of the word
+        return self.search(word)
+
+    def __getitem__(self, word):
+        # Time Complexity: O(m)
+        node = self._find(word)
+        if node is None or not node.is_end:
+            raise KeyError(word)
+        return node.value
+
+    def __setitem__(self, word, value):
+        # Time Complexity: O(m), plus insert() when the word is new
+        node = self._find(word)
+        if node is None or not node.is_end:
+            self.insert(word)
+            node = self._find(word)
+        node.value = value
+
+    def __delitem__(self, word):
+        # Time Complexity: O(m)
+        if not self.search(word):
+            raise KeyError(word)
+        self.delete(word)
+
+    def get(self, word, default=None):
+        # Time Complexity: O(m)
+        node = self._find(word)
+        return node.value if node is not None and node.is_end else default
+
+    def pop(self, word, *default):
+        # Time Complexity: O(m)
+        node = self._find(word)
+        if node is None or not node.is_end:
+            if default:
+                return default[0]
+            raise KeyError(word)
+        value = node.value
+        self.delete(word)
+        return value
+
+    def keys(self, prefix=""):
+        # Time Complexity: O(m + k) for k characters below the prefix
+        # Yields every word starting with prefix
+        for word, _ in self._walk(prefix):
+            yield word
+
+    def items(self, prefix=""):
+        # Time Complexity: O(m + k) for k characters below the prefix
+        # Yields (word, value) for every word starting with prefix
+        for word, node in self._walk(prefix):
+            yield word, node.value
+
+    def _walk(self, prefix):
+        # Time Complexity: O(m + k), O(depth) extra memory
+        # Depth-first generator of (word, node) for the words below prefix; one
+        # shared path buffer is extended and trimmed instead of copied per node
+        node = self._find(prefix)
+        if node is None:
+            return
+        path = list(prefix)
+        if node.is_end:
+            yield prefix, node
+        stack = [iter(node.children.items())] if node.children else []
+        while stack:
+            for char, child_node in stack[-1]:
+                path.append(char)
+                if child_node.is_end:
+                    yield "".join(path), child_node
+                if child_node.children:
+                    stack.append(iter(child_node.children.items()))
+                else:
+                    path.pop()
+                break
+            else:
+                stack.pop()  # Every child of this node is done
+                if stack:
+                    path.pop()
+
+    def count_prefix(self, prefix):
+        # Time Complexity: O(m), where m is the length of the prefix
+        node = self._find(prefix)
+        return node.count if node is not None else 0
+
+    def insert(self, word, weight=None):
+        # Time Complexity: O(m · c) with c = cache_size, O(m · c · log c) when an
+        # existing word's weight is lowered
+        # A new word gets weight 0 unless one is given; inserting an existing
+        # word only changes its weight when one is given
         node = self.root
+        path = [node]
         for char in word:
+            if node.children is None:
+                node.children = {}
             if char not in node.children:
+                if node.top is None and node.children:
+                    node.top = list(self._cached(node))  # A chain turns into a branch
                 node.children[char] = Node()  # Add a new child node if it doesn't exist
             node = node.children[char]
+            path.append(node)
+        if weight is None:
+            if node.is_end:
+                return  # Already present, nothing to update
+            weight = 0
+        if node.top is None:
+            node.top = list(self._cached(node))
+        old = (-node.weight, word) if node.is_end else None
+        new = (-weight, word)
+        if not node.is_end:
+            for path_node in path:
+                path_node.count += 1  # One more word below every node on the path
         node.is_end = True  # Mark the end of the word
+        node.weight = weight
+        if old is None or new <= old:
+            self._promote(path, old, new)
+        else:
+            self._refresh_path(word)  # A lowered weight may let other words in
+
+    def complete(self, prefix, k=10):
+        # Time Complexity: O(m + d + k) when k <= cache_size, d the length of the
+        # single-child chain below the prefix
+        # Returns up to k words starting with prefix, highest weight first
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        node = self._find(prefix)
+        if node is None:
+            return []
+        if k <= self.cache_size:
+            return [word for _, word in self._cached(node)[:k]]
+        # Larger requests than the cache holds fall back to a subtree walk
+        ranked = ((-node.weight, word) for word, node in self._walk(prefix))
+        return [word for _, word in heapq.nsmallest(k, ranked)]
+
+    def fuzzy_search(self, word, max_distance):
+        # Time Complexity: O(v · m) for v visited nodes, m the length of word
+        # Returns (word, distance) pairs within max_distance edits, closest first
+        # Each node carries one row of the Levenshtein table; a branch is pruned
+        # as soon as every entry in its row exceeds max_distance
+        res = []
+        first_row = list(range(len(word) + 1))
+        if self.root.is_end and first_row[-1] <= max_distance:
+            res.append(("", first_row[-1]))
+        stack = [(self.root, "", first_row)]
+        while stack:
+            node, prefix, prev_row = stack.pop()
+            if node.children is None:
+                continue
+            for char, child_node in node.children.items():
+                row = [prev_row[0] + 1]
+                for i in range(1, len(word) + 1):
+                    row.append(
+                        min(
+                            row[i - 1] + 1,
+                            prev_row[i] + 1,
+                            prev_row[i - 1] + (word[i - 1] != char),
+                        )
+                    )
+                if child_node.is_end and row[-1] <= max_distance:
+                    res.append((prefix + char, row[-1]))
+                if min(row) <= max_distance:
+                    stack.append((child_node, prefix + char, row))
+        res.sort(key=lambda match: (match[1], match[0]))
+        return res
+
+    def _extend_sorted(self, words):
+        # Time Complexity: O(L + n · c)
+        # Body of from_sorted, run on an empty trie
+        cache_size = self.cache_size
+        self.root.top = []  # Every node keeps a cache while it is on the path
+        path = [self.root]
+        prev = ""
+        for word in words:
+            if word < prev:
+                raise ValueError("Input must be sorted")
+            common = 0
+            limit = min(len(prev), len(word))
+            while common < limit and prev[common] == word[common]:
+                common += 1
+            while len(path) > common + 1:
+                self._seal(path.pop(), path[-1])
+            for char in word[common:]:
+                node = Node()
+                node.top = []
+                if path[-1].children is None:
+                    path[-1].children = {}
+                path[-1].children[char] = node
+                path.append(node)
+            if path[-1].is_end:
+                continue  # Duplicate of the previous word
+            path[-1].is_end = True
+            path[-1].count += 1
+            # All weights are 0, so words rank in input order: append until a
+            # full cache, whose ancestors are full as well
+            entry = (0, word)
+            for node in reversed(path):
+                if len(node.top) >= cache_size:
+                    break
+                node.top.append(entry)
+            prev = word
+        while len(path) > 1:
+            self._seal(path.pop(), path[-1])
+        if not self.root.is_end and len(self.root.children or ()) < 2:
+            self.root.top = None
+
+    def _seal(self, node, parent):
+        # Time Complexity: O(1)
+        # Finishes a node that from_sorted has moved past: its count is final,
+        # and a chain node drops the cache it kept while it was on the path
+        parent.count += node.count
+        if not node.is_end and len(node.children) == 1:
+            node.top = None
+
+    def _cached(self, node):
+        # Time Complexity: O(d) for d single-child nodes below node
+        # Only branching and word-ending nodes keep a cache: a chain of
+        # single-child nodes has exactly the completions of the node it leads to
+        while node.top is None:
+            if node.children is None:
+                return []  # Empty root
+            (node,) = node.children.values()
+        return node.top
+
+    def _graft(self, shards):
+        # Time Complexity: O(k) for k nodes
+        # Rebuilds the flattened subtries from _build_shard under the root,
+        # keeping their counts and caches; the root's own cache is left stale
+        root = self.root
+        for chars, degrees, counts, tops in shards:
+            if root.children is None:
+                root.children = {}
+            parents = [root]
+            remaining = [1]  # Children still to attach per node in parents
+            for char, degree, count, top in zip(chars, degrees, counts, tops):
+                node = Node()
+                node.is_end = bool(degree & END_FLAG)
+                node.count = count
+                node.top = top
+                parents[-1].children[char] = node
+                remaining[-1] -= 1
+                while remaining and not remaining[-1]:
+                    parents.pop()
+                    remaining.pop()
+                if degree & ~END_FLAG:
+                    node.children = {}
+                    parents.append(node)
+                    remaining.append(degree & ~END_FLAG)
+            root.count += counts[0]
+
+    def _promote(self, path, old, new):
+        # Time Complexity: O(m · c)
+        # Moves a new or heavier entry into the caches along path, bottom-up
+        for node in reversed(path):
+            top = node.top
+            if top is None:
+                continue  # Chain node, reads the cache below
+            if old is not None and old in top:
+                top.remove(old)
+            elif len(top) >= self.cache_size and not new < top[-1]:
+                break  # Not ranked here, so not ranked by any ancestor either
+            insort(top, new)
+            del top[self.cache_size :]
+
+    def _rerank(self, node, word):
+        # Time Complexity: O(c · log c) per child
+        # Recomputes the cached completions of a node from its children
+        if node.children is None:
+            node.top = [(-node.weight, word)] if node.is_end else None
+            return
+        if len(node.children) == 1:
+            if not node.is_end:
+                node.top = None  # Chain node, reads the cache below
+                return
+            # Copy the only child's ranking and slot in our word
+            (child_node,) = node.children.values()
+            node.top = list(self._cached(child_node))
+            insort(node.top, (-node.weight, word))
+            del node.top[self.cache_size :]
+            return
+        ranked = heapq.merge(*(self._cached(child) for child in node.children.values()))
+        if node.is_end:
+            ranked = heapq.merge([(-node.weight, word)], ranked)
+        node.top = list(islice(ranked, self.cache_size))
+
+    def _refresh_path(self, word):
+        # Time Complexity: O(m · c · log c)
+        # Rebuilds the cached completions bottom-up along the nodes of word
+        path = [self.root]
+        for char in word:
+            children = path[-1].children
+            if children is None or char not in children:
+                break
+            path.append(children[char])
+        for depth in range(len(path) - 1, -1, -1):
+            self._rerank(path[depth], word[:depth])
+
+    def freeze(self, path):
+        # Time Complexity: O(n log σ), where σ is the alphabet size
+        # Writes a read-only layout that FrozenTrie.open can mmap (weights and
+        # completion caches are not stored)
+        node_words = array("I")
+        edge_words = array("I")
+        word_count = 0
+        next_id = 1
+        queue = deque([self.root])
+        # Breadth-first order gives every node's edges a contiguous slice
+        while queue:
+            node = queue.popleft()
+            word_count += node.is_end
+            node_words.append(len(edge_words) // 2)
+            node_words.append(
+                len(node.children or ()) | (END_FLAG if node.is_end else 0)
+            )
+            for char in sorted(node.children or ()):
+                edge_words.append(ord(char))
+                edge_words.append(next_id)
+                next_id += 1
+                queue.append(node.children[char])
+        header = array(
+            "I",
+            [FROZEN_MAGIC, FROZEN_VERSION, next_id, len(edge_words) // 2, word_count],
+        )
+        with open(path, "wb") as f:
+            header.tofile(f)
+            node_words.tofile(f)
+            edge_words.tofile(f)
 
     def search(self, word):
         # Time Complexity: O(m), where m is the length of the word
+        node = self._find(word)
+        return node is not None and node.is_end  # Check if it's the end of a word
+
+    def _find(self, word):
+        # Time Complexity: O(m)
+        # Returns the node reached by spelling word, or None
         node = self.root
         for char in word:
-            if char not in node.children:
-                return False  # If a character is missing, the word doesn't exist
+            if node.children is None or char not in node.children:
+                return None  # If a character is missing, the word doesn't exist
             node = node.children[char]
-        return node.is_end  # Check if it's the end of a word
+        return node
 
     def delete(self, word):
+        # Time Complexity: O(m · c · log c) with c = cache_size
+        path = [self.root]
+        for char in word:
+            children = path[-1].children
+            if children is None or char not in children:
+                return  # Word doesn't exist
+            path.append(children[char])
+        node = path[-1]
+        if not node.is_end:
+            return  # Word doesn't exist
+        node.is_end = False  # Unmark the end of the word
+        node.value = None
+        for path_node in path:
+            path_node.count -= 1  # One fewer word below every node on the path
+        # Prune the nodes that no longer lead to any word, deepest first
+        for depth in range(len(word), 0, -1):
+            if path[depth].count:
+                break
+            parent = path[depth - 1]
+            del parent.children[word[depth - 1]]
+            if not parent.children:
+                parent.children = None
+        self._refresh_path(word)
+
+    def starts_with(self, prefix):
+        # Time Complexity: O(m), where m is the length of the prefix
+        return self._find(prefix) is not None  # All characters of the prefix were found
+
+
+def _build_shard(shard):
+    # Process pool worker for Trie.build_parallel: builds the words sharing one
+    # first character and returns the subtrie flattened in preorder, as pickling
+    # the nodes themselves recurses once per character of the longest word
+    words, cache_size = shard
+    trie = Trie.from_sorted(words, cache_size=cache_size)
+    chars = []
+    degrees = array("I")  # Child count | END_FLAG per node
+    counts = array("I")
+    tops = []
+    stack = list(trie.root.children.items())
+    while stack:
+        char, node = stack.pop()
+        chars.append(char)
+        children = node.children or {}
+        degrees.append(len(children) | (END_FLAG if node.is_end else 0))
+        counts.append(node.count)
+        tops.append(node.top)
+        stack.extend(reversed(children.items()))
+    return "".join(chars), degrees, counts, tops
+
+
+class FrozenTrie:
+    # Read-only trie queried straight from the buffer written by Trie.freeze;
+    # nothing is deserialized, and processes mapping the same file share pages
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.words = memoryview(buffer).cast("I")
+        if self.words[0] != FROZEN_MAGIC or self.words[1] != FROZEN_VERSION:
+            raise ValueError("Not a frozen trie file")
+        self.node_count = self.words[2]
+        self.edges = HEADER_WORDS + 2 * self.node_count  # Offset of the edge table
+
+    @classmethod
+    def open(cls, path):
+        # Time Complexity: O(1)
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self):
+        self.words.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        # Time Complexity: O(n)
+        return "\n".join(self.keys())
+
+    def __len__(self):
+        # Time Complexity: O(1)
+        return self.words[4]
+
+    def __iter__(self):
+        # Time Complexity: O(n)
+        return self.keys()
+
+    def __contains__(self, word):
+        # Time Complexity: O(m log σ)
+        return self.search(word)
+
+    def search(self, word):
+        # Time Complexity: O(m log σ), where σ is the alphabet size
+        node = self._find(word)
+        return node is not None and self._is_end(node)
+
+    def starts_with(self, prefix):
+        # Time Complexity: O(m log σ)
+        return self._find(prefix) is not None
+
+    def keys(self, prefix=""):
+        # Time Complexity: O(m log σ + k) for k characters below the prefix
+        # Yields the words starting with prefix in lexicographic order
+        node = self._find(prefix)
+        if node is None:
+            return
+        words, edges = self.words, self.edges
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            if self._is_end(node):
+                yield word
+            first = words[HEADER_WORDS + 2 * node]
+            count = words[HEADER_WORDS + 2 * node + 1] & ~END_FLAG
+            for edge in range(first + count - 1, first - 1, -1):
+                stack.append(
+                    (words[edges + 2 * edge + 1], word + chr(words[edges + 2 * edge]))
+                )
+
+    def _is_end(self, node):
+        # Time Complexity: O(1)
+        return bool(self.words[HEADER_WORDS + 2 * node + 1] & END_FLAG)
+
+    def _find(self, word):
+        # Time Complexity: O(m log σ)
+        # Binary-searches each node's sorted edges; returns the node index or None
+        words, edges = self.words, self.edges
+        node = 0
+        for char in word:
+            code = ord(char)
+            lo = words[HEADER_WORDS + 2 * node]
+            end = hi = lo + (words[HEADER_WORDS + 2 * node + 1] & ~END_FLAG)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if words[edges + 2 * mid] < code:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == end or words[edges + 2 * lo] != code:
+                return None
+            node = words[edges + 2 * lo + 1]
+        return node
+
+
+class AhoCorasick:
+    # Multi-pattern matcher compiled from the words of a Trie: the trie's edges
+    # become goto transitions, plus failure links and output links
+    def __init__(self, trie):
+        # Time Complexity: O(n · σ) for n trie nodes and alphabet size σ
+        self.goto = [{}]  # Per state: character -> next state
+        self.fail = [0]  # Longest proper suffix of the state that is also a state
+        self.output = [None]  # Pattern ending at the state, if any
+        self.link = [0]  # Nearest suffix state with an output (0 for none)
+        queue = deque([(trie.root, 0, "")])
+        # Breadth-first order guarantees fail targets are built before use
+        while queue:
+            node, state, word = queue.popleft()
+            if node.children is None:
+                continue
+            for char, child_node in node.children.items():
+                child = len(self.goto)
+                self.goto[state][char] = child
+                self.goto.append({})
+                self.output.append(word + char if child_node.is_end else None)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0) if state else 0
+                self.fail.append(target)
+                self.link.append(
+                    target if self.output[target] is not None else self.link[target]
+                )
+                queue.append((child_node, child, word + char))
+
+    def finditer(self, stream, encoding="utf-8"):
+        # Time Complexity: O(n + z) for n characters and z matches
+        # Yields (start position, pattern) for every occurrence, overlapping ones
+        # included; stream is a str/bytes or an iterable of str/bytes chunks, and
+        # matches may span chunk boundaries
+        goto, fail, output, link = self.goto, self.fail, self.output, self.link
+        state = 0
+        pos = 0
+        for chunk in self._decode(stream, encoding):
+            for char in chunk:
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                pos += 1
+                match = state if output[state] is not None else link[state]
+                while match:
+                    yield pos - len(output[match]), output[match]
+                    match = link[match]
+
+    def _decode(self, stream, encoding):
+        # Time Complexity: O(n)
+        # Turns the input into str chunks; multi-byte characters split across
+        # bytes chunks are reassembled by an incremental decoder
+        if isinstance(stream, (str, bytes)):
+            stream = [stream]
+        decoder = None
+        for chunk in stream:
+            if isinstance(chunk, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(encoding)()
+                chunk = decoder.decode(chunk)
+            yield chunk
+        if decoder is not None:
+            yield decoder.decode(b"", final=True)
+
+
+class RadixNode:
+    __slots__ = ("label", "children", "is_end")
+
+    def __init__(self, label=""):
+        self.label = label  # Substring on the edge leading into this node
+        self.children = {}  # First character of each child's label -> child
+        self.is_end = False
+
+
+class RadixTrie:
+    # Compressed trie: chains of single-child nodes are merged into one edge
+    # labeled with the whole substring
+    def __init__(self):
+        self.root = RadixNode()
+
+    def __repr__(self):
+        # Time Complexity: O(n), where n is the total number of characters in all words
+        res = []
+        stack = [(self.root, "")]
+        while stack:
+            node, word = stack.pop()
+            if node.is_end:
+                res.append(word)
+            for child_node in reversed(list(node.children.values())):
+                stack.append((child_node, word + child_node.label))
+        return "\n".join(res)
+
+    def insert(self, word):
         # Time Complexity: O(m), where m is the length of the word
-        def _delete(node, word, index):
-            if index == len(word):
-                if not node.is_end:
-                    return False  # Word doesn't exist
-                node.is_end = False  # Unmark the end of the word
-                return len(node.children) == 0  # Delete the node if it's empty
-            char = word[index]
-            if char not in node.children:
-                return False  # Word doesn't exist
-            child_node = node.children[char]
-            should_delete = _delete(child_node, word, index + 1)
-            if should_delete:
-                del node.children[char]  # Remove the child node if needed
-                return len(node.children) == 0
-            return False
+        node = self.root
+        i = 0
+        while i < len(word):
+            child_node = node.children.get(word[i])
+            if child_node is None:
+                leaf = RadixNode(word[i:])  # The rest of the word becomes one edge
+                leaf.is_end = True
+                node.children[word[i]] = leaf
+                return
+            label = child_node.label
+            if word.startswith(label, i):
+                node = child_node
+                i += len(label)
+                continue
+            # The word leaves the edge part-way: split it at the divergence
+            j = 1
+            while i + j < len(word) and word[i + j] == label[j]:
+                j += 1
+            middle = RadixNode(label[:j])
+            child_node.label = label[j:]
+            middle.children[label[j]] = child_node
+            node.children[word[i]] = middle
+            node = middle
+            i += j
+        node.is_end = True
 
-        _delete(self.root, word, 0)
+    def search(self, word):
+        # Time Complexity: O(m), where m is the length of the word
+        node = self._find(word)
+        return node is not None and node.is_end
 
     def starts_with(self, prefix):
         # Time Complexity: O(m), where m is the length of the prefix
         node = self.root
-        for char in prefix:
-            if char not in node.children:
-                return False  # Prefix doesn't exist
-            node = node.children[char]
-        return True  # All characters of the prefix were found
+        i = 0
+        while i < len(prefix):
+            child_node = node.children.get(prefix[i])
+            if child_node is None:
+                return False
+            label = child_node.label
+            if not prefix.startswith(label, i):
+                # The prefix may end part-way along the edge
+                return label.startswith(prefix[i:])
+            node = child_node
+            i += len(label)
+        return True
+
+    def delete(self, word):
+        # Time Complexity: O(m), where m is the length of the word
+        parent, node = None, self.root
+        i = 0
+        while i < len(word):
+            child_node = node.children.get(word[i])
+            if child_node is None or not word.startswith(child_node.label, i):
+                return  # Word doesn't exist
+            parent, node = node, child_node
+            i += len(child_node.label)
+        if not node.is_end:
+            return
+        node.is_end = False
+        if node is self.root:
+            return
+        if not node.children:
+            # Drop the leaf, then its parent may be left as a single-child chain
+            del parent.children[node.label[0]]
+            node = parent
+        if node is not self.root and not node.is_end and len(node.children) == 1:
+            # Merge the node with its only child into one edge
+            (child_node,) = node.children.values()
+            node.label += child_node.label
+            node.children = child_node.children
+            node.is_end = child_node.is_end
+
+    def _find(self, word):
+        # Time Complexity: O(m)
+        node = self.root
+        i = 0
+        while i < len(word):
+            child_node = node.children.get(word[i])
+            if child_node is None or not word.startswith(child_node.label, i):
+                return None
+            node = child_node
+            i += len(child_node.label)
+        return node
 
 
 if __name__ == "__main__":
@@ -118,6 +820,78 @@ if __name__ == "__main__":
     print("Search for 'bandage' after deletion:", trie.search("bandage"))  # False
     print()
 
+    # Test weighted autocomplete
+    ranked = Trie(cache_size=3)
+    for word, weight in [("car", 5), ("cart", 9), ("care", 2), ("cat", 7), ("dog", 4)]:
+        ranked.insert(word, weight)
+    print("Top 2 completions for 'ca':", ranked.complete("ca", 2))  # ['cart', 'cat']
+    ranked.insert("care", 10)  # Raise a weight
+    ranked.delete("cart")
+    # ['care', 'cat', 'car']
+    print("Top 3 completions for 'ca':", ranked.complete("ca", 3))
+    print("Top 5 completions for '':", ranked.complete("", 5))
+    print()
+
+    # Test bulk building from sorted words
+    bulk = Trie.from_sorted(["a", "ap", "app", "apple", "banana", "band", "bandana"])
+    print("Bulk-built words:", list(bulk), "| count:", len(bulk))
+    print("Bulk-built completions for 'ban':", bulk.complete("ban", 2))
+    print()
+
+    # Test streaming enumeration
+    print("Words via iteration:", list(trie))
+    print("Keys under 'band':", list(trie.keys("band")))
+    print()
+
+    # Test counting and the mapping interface
+    print("Number of words:", len(trie))
+    print("Words starting with 'band':", trie.count_prefix("band"))
+    trie["band"] = "music group"
+    trie["bangle"] = "jewellery"  # Adds a new word
+    print("Value of 'band':", trie["band"], "| get('bat'):", trie.get("bat", "missing"))
+    print("Items under 'ban':", list(trie.items("ban")))
+    print("Popped 'bangle':", trie.pop("bangle"), "| words now:", len(trie))
+    print()
+
+    # Test fuzzy search
+    print("Words within 1 edit of 'bandt':", trie.fuzzy_search("bandt", 1))
+    print("Words within 2 edits of 'banan':", trie.fuzzy_search("banan", 2))
+    print()
+
+    # Test Aho-Corasick multi-pattern matching over a chunked stream
+    matcher = AhoCorasick(trie)
+    chunks = ["I ate a ban", "ana and a band", "age"]
+    print("Matches in stream:", list(matcher.finditer(chunks)))
+    print()
+
+    # Test freezing to a memory-mapped file
+    import os
+    import tempfile
+
+    frozen_path = os.path.join(tempfile.mkdtemp(), "words.trie")
+    trie.freeze(frozen_path)
+    with FrozenTrie.open(frozen_path) as frozen:
+        print("Frozen words:", len(frozen))
+        print("Frozen search 'bandit':", frozen.search("bandit"))  # True
+        print("Frozen starts with 'bando':", frozen.starts_with("bando"))  # False
+        print("Frozen words starting with 'ban':", list(frozen.keys("ban")))
+    print()
+
+    # Test the compressed radix trie
+    radix = RadixTrie()
+    for word in ["/usr/bin/python", "/usr/bin/perl", "/usr/lib", "/usr"]:
+        radix.insert(word)
+    print(
+        "Radix edges under root:",
+        [child.label for child in radix.root.children.values()],
+    )
+    print("Search '/usr/bin/perl':", radix.search("/usr/bin/perl"))  # True
+    print("Starts with '/usr/bi':", radix.starts_with("/usr/bi"))  # True
+    radix.delete("/usr/lib")
+    print("Radix contents after deleting '/usr/lib':")
+    print(radix)
+    print()
+
     # Final Trie state
     print("Final Trie contents:")
     print(trie)